@@ -1,10 +1,12 @@
 """Action item extraction agent."""
 import logging
+from operator import itemgetter
 from typing import List, Optional
 
 from backend.models.email import Email, ActionItem
-from backend.services.llm_service import LLMService
-from backend.services.database_service import DatabaseService
+from backend.services.llm_service import get_llm_service
+from backend.services.database_service import get_database_service
+from backend.utils.background import schedule_write
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +16,8 @@ class ActionItemAgent:
 
     def __init__(self):
         """Initialize action item agent."""
-        self.llm_service = LLMService()
-        self.db_service = DatabaseService()
+        self.llm_service = get_llm_service()
+        self.db_service = get_database_service()
 
     async def extract_action_items(
         self,
@@ -24,16 +26,8 @@ class ActionItemAgent:
     ) -> Email:
         """Extract action items from a single email."""
         try:
-            email_content = f"""
-Subject: {email.subject}
-From: {email.sender}
-To: {email.recipient}
-Date: {email.timestamp}
+            email_content = email.formatted_content
 
-Body:
-{email.body}
-"""
-            
             # Get custom prompt if provided
             if not custom_prompt:
                 prompt_config = await self.db_service.get_active_prompt("action_item")
@@ -51,8 +45,8 @@ Body:
                 ActionItem(**item) for item in action_items_data
             ]
             
-            # Save updated email
-            await self.db_service.save_email(email)
+            # Persist in the background so the caller isn't blocked on the DB
+            schedule_write(self.db_service.save_email(email))
             
             logger.info(f"Extracted {len(email.action_items)} action items from email {email.id}")
             return email
@@ -66,8 +60,16 @@ Body:
     ) -> List[dict]:
         """Get all action items from all emails."""
         try:
+            # Prefer the server-side aggregation: unwind, filter and sort run
+            # on MongoDB instead of shipping full email docs to Python
+            aggregated = await self.db_service.aggregate_action_items(include_completed)
+            if aggregated is not None:
+                return aggregated
+
+            # Fallback: Python-side scan over fully loaded emails
             emails = await self.db_service.get_all_emails(limit=1000)
-            
+
+            priority_order = {"High": 0, "Medium": 1, "Low": 2}
             all_action_items = []
             for email in emails:
                 for action_item in email.action_items:
@@ -76,15 +78,16 @@ Body:
                             "email_id": email.id,
                             "email_subject": email.subject,
                             "email_sender": email.sender,
-                            "action_item": action_item.model_dump()
+                            "action_item": action_item.model_dump(),
+                            # Numeric priority resolved once here so the sort
+                            # key below runs at C speed
+                            "_priority": priority_order.get(action_item.priority, 3)
                         })
-            
-            # Sort by priority
-            priority_order = {"High": 0, "Medium": 1, "Low": 2}
-            all_action_items.sort(
-                key=lambda x: priority_order.get(x["action_item"]["priority"], 3)
-            )
-            
+
+            all_action_items.sort(key=itemgetter("_priority"))
+            for item in all_action_items:
+                del item["_priority"]
+
             return all_action_items
         except Exception as e:
             logger.error(f"Error getting all action items: {e}")
@@ -97,18 +100,16 @@ Body:
     ) -> bool:
         """Mark an action item as completed."""
         try:
-            email = await self.db_service.get_email(email_id)
-            if not email:
-                logger.warning(f"Email {email_id} not found")
-                return False
-            
-            for action_item in email.action_items:
-                if action_item.description == action_item_description:
-                    action_item.completed = True
-                    await self.db_service.save_email(email)
-                    logger.info(f"Marked action item as complete: {action_item_description}")
-                    return True
-            
+            # Single positional update: no full email fetch, Python scan or
+            # whole-document rewrite
+            updated = await self.db_service.complete_action_item(
+                email_id,
+                action_item_description
+            )
+            if updated:
+                logger.info(f"Marked action item as complete: {action_item_description}")
+                return True
+
             logger.warning(f"Action item not found: {action_item_description}")
             return False
         except Exception as e:
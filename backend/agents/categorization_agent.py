@@ -1,10 +1,13 @@
 """Email categorization agent."""
+import asyncio
 import logging
 from typing import Optional
 
+from backend.config.settings import settings
 from backend.models.email import Email, EmailCategory
-from backend.services.llm_service import LLMService
-from backend.services.database_service import DatabaseService
+from backend.services.llm_service import get_llm_service
+from backend.services.database_service import get_database_service
+from backend.utils.background import schedule_write
 
 logger = logging.getLogger(__name__)
 
@@ -14,26 +17,19 @@ class CategorizationAgent:
 
     def __init__(self):
         """Initialize categorization agent."""
-        self.llm_service = LLMService()
-        self.db_service = DatabaseService()
+        self.llm_service = get_llm_service()
+        self.db_service = get_database_service()
 
     async def categorize_single_email(
         self,
         email: Email,
-        custom_prompt: Optional[str] = None
+        custom_prompt: Optional[str] = None,
+        save: bool = True
     ) -> Email:
         """Categorize a single email."""
         try:
-            email_content = f"""
-Subject: {email.subject}
-From: {email.sender}
-To: {email.recipient}
-Date: {email.timestamp}
-
-Body:
-{email.body}
-"""
-            
+            email_content = email.formatted_content
+
             # Get custom prompt if provided, otherwise use default
             if not custom_prompt:
                 prompt_config = await self.db_service.get_active_prompt("categorization")
@@ -55,8 +51,10 @@ Body:
             
             email.category_reason = result.get('reason', 'No reason provided')
             
-            # Save updated email
-            await self.db_service.save_email(email)
+            # Persist in the background so the caller isn't blocked on the DB
+            # round-trip (batch callers persist via bulk upsert instead)
+            if save:
+                schedule_write(self.db_service.save_email(email))
             
             logger.info(f"Categorized email {email.id} as {email.category.value}")
             return email
@@ -70,17 +68,60 @@ Body:
     ) -> int:
         """Recategorize all emails in database."""
         try:
-            emails = await self.db_service.get_all_emails(limit=1000)
+            # Stream emails from the cursor rather than loading all of them
+            # up front; the window below bounds how many are alive at once
+            email_iter = self.db_service.iter_emails(limit=1000)
+
+            # Bound concurrency so parallel Gemini calls stay under rate limits
+            semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+
+            async def _bounded_categorize(email: Email):
+                async with semaphore:
+                    return await self.categorize_single_email(
+                        email, custom_prompt, save=False
+                    )
+
+            # Keep a sliding window of in-flight tasks instead of scheduling
+            # every email at once, so peak memory stays bounded on large inboxes
+            in_progress = {}
+
+            async def _submit_next():
+                email = await anext(email_iter, None)
+                if email is not None:
+                    task = asyncio.create_task(_bounded_categorize(email))
+                    in_progress[task] = email
+
+            for _ in range(settings.llm_window_size):
+                await _submit_next()
+
+            # Accumulate categorized emails and persist them in bulk chunks
+            # rather than one Mongo round-trip per email
+            flush_size = 200
+            pending_saves = []
             count = 0
-            
-            for email in emails:
-                try:
-                    await self.categorize_single_email(email, custom_prompt)
-                    count += 1
-                except Exception as e:
-                    logger.error(f"Failed to recategorize email {email.id}: {e}")
-                    continue
-            
+            while in_progress:
+                done, _ = await asyncio.wait(
+                    in_progress,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    email = in_progress.pop(task)
+                    if task.exception() is not None:
+                        logger.error(
+                            f"Failed to recategorize email {email.id}: {task.exception()}"
+                        )
+                    else:
+                        pending_saves.append(task.result())
+                        count += 1
+                    await _submit_next()
+
+                if len(pending_saves) >= flush_size:
+                    await self.db_service.save_emails(pending_saves)
+                    pending_saves = []
+
+            if pending_saves:
+                await self.db_service.save_emails(pending_saves)
+
             logger.info(f"Recategorized {count} emails")
             return count
         except Exception as e:
@@ -90,12 +131,12 @@ Body:
     async def get_category_statistics(self) -> dict:
         """Get statistics for email categories."""
         try:
-            stats = {}
-            for category in EmailCategory:
-                count = await self.db_service.get_email_count(category=category)
-                stats[category.value] = count
-            
-            return stats
+            # Single $group aggregation instead of one count query per category
+            counts = await self.db_service.category_counts()
+            return {
+                category.value: counts.get(category.value, 0)
+                for category in EmailCategory
+            }
         except Exception as e:
             logger.error(f"Error getting category statistics: {e}")
             return {}
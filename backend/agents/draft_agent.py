@@ -1,23 +1,28 @@
 """Email draft generation agent."""
 import logging
-from typing import Optional, List
+import re
+from typing import AsyncIterator, Optional, List, Union
 from datetime import datetime
 
 from backend.models.email import Email
 from backend.models.draft import EmailDraft
-from backend.services.llm_service import LLMService
-from backend.services.database_service import DatabaseService
+from backend.services.llm_service import get_llm_service
+from backend.services.database_service import get_database_service
 
 logger = logging.getLogger(__name__)
 
+# Strips an optional bullet prefix and surrounding whitespace in one pass;
+# lines that are empty or start with '#' (headings) produce no match
+_BULLET_RE = re.compile(r'^\s*(?:[-*•]+\s*)?(?P<text>[^#\s].*?)\s*$')
+
 
 class DraftAgent:
     """Agent for generating email drafts."""
 
     def __init__(self):
         """Initialize draft agent."""
-        self.llm_service = LLMService()
-        self.db_service = DatabaseService()
+        self.llm_service = get_llm_service()
+        self.db_service = get_database_service()
 
     async def generate_reply_draft(
         self,
@@ -33,15 +38,9 @@ class DraftAgent:
                 if prompt_config:
                     custom_prompt = prompt_config.prompt_text
             
-            # Prepare original email content
-            original_content = f"""
-Subject: {original_email.subject}
-From: {original_email.sender}
-Date: {original_email.timestamp}
+            # Prepare original email content (cached on the model)
+            original_content = original_email.formatted_content
 
-{original_email.body}
-"""
-            
             # Generate reply body
             reply_body = await self.llm_service.draft_reply(
                 original_email=original_content,
@@ -77,16 +76,15 @@ Date: {original_email.timestamp}
             logger.error(f"Error generating reply draft: {e}")
             raise
 
-    async def generate_new_draft(
-        self,
+    @staticmethod
+    def _new_draft_prompt(
         recipient: str,
         subject: str,
         instructions: str,
-        context: Optional[str] = None
-    ) -> EmailDraft:
-        """Generate a new email draft from instructions."""
-        try:
-            prompt = f"""Write a professional email with the following details:
+        context: Optional[str]
+    ) -> str:
+        """Build the prompt for a new draft from the form fields."""
+        return f"""Write a professional email with the following details:
 
 Recipient: {recipient}
 Subject: {subject}
@@ -95,6 +93,19 @@ Instructions: {instructions}
 
 Write only the email body (no subject line):"""
 
+    async def generate_new_draft(
+        self,
+        recipient: str,
+        subject: str,
+        instructions: str,
+        context: Optional[str] = None
+    ) -> EmailDraft:
+        """Generate a new email draft from instructions."""
+        try:
+            prompt = self._new_draft_prompt(
+                recipient, subject, instructions, context
+            )
+
             body = await self.llm_service.generate_text(prompt, temperature=0.7)
             
             draft = EmailDraft(
@@ -111,6 +122,41 @@ Write only the email body (no subject line):"""
             logger.error(f"Error generating new draft: {e}")
             raise
 
+    async def astream_new_draft(
+        self,
+        recipient: str,
+        subject: str,
+        instructions: str,
+        context: Optional[str] = None
+    ) -> AsyncIterator[Union[str, EmailDraft]]:
+        """Stream a new draft's body as the model generates it.
+
+        Yields body chunks as they arrive so the UI can show text at
+        time-to-first-token instead of time-to-last-token; once the
+        stream ends, the persisted EmailDraft is yielded as the final
+        item.
+        """
+        prompt = self._new_draft_prompt(
+            recipient, subject, instructions, context
+        )
+
+        chunks: List[str] = []
+        async for chunk in self.llm_service.generate_with_stream(
+            prompt, temperature=0.7
+        ):
+            chunks.append(chunk)
+            yield chunk
+
+        draft = EmailDraft(
+            recipient=recipient,
+            subject=subject,
+            body="".join(chunks).strip()
+        )
+        await self.db_service.save_draft(draft)
+
+        logger.info(f"Generated new draft {draft.id} (streamed)")
+        yield draft
+
     async def _generate_followups(
         self,
         original_email: Email,
@@ -122,7 +168,7 @@ Write only the email body (no subject line):"""
 
 Original Email:
 Subject: {original_email.subject}
-{original_email.body[:300]}
+{original_email.body_preview}
 
 Reply:
 {reply_body[:300]}
@@ -133,11 +179,11 @@ List follow-up actions (one per line):"""
             
             # Parse response into list
             followups = [
-                line.strip().lstrip('-•*').strip()
+                match.group('text')
                 for line in response.split('\n')
-                if line.strip() and not line.strip().startswith('#')
+                if (match := _BULLET_RE.match(line))
             ]
-            
+
             return followups[:3]  # Limit to 3 suggestions
         except Exception as e:
             logger.warning(f"Error generating follow-ups: {e}")
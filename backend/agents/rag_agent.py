@@ -1,22 +1,30 @@
 """RAG (Retrieval-Augmented Generation) agent for email queries."""
+import hashlib
 import logging
+import re
 from typing import Optional
 
-from backend.services.llm_service import LLMService
-from backend.services.vector_service import VectorService
-from backend.services.database_service import DatabaseService
+from backend.services.llm_service import get_llm_service
+from backend.services.vector_service import get_vector_service
+from backend.services.database_service import get_database_service
+from backend.utils.ttl_cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
+# Fixed query used to surface urgent emails; its embedding never changes
+URGENT_QUERY = "urgent important immediate action required critical"
+
 
 class RAGAgent:
     """Agent for answering questions using RAG."""
 
     def __init__(self):
         """Initialize RAG agent."""
-        self.llm_service = LLMService()
-        self.vector_service = VectorService()
-        self.db_service = DatabaseService()
+        self.llm_service = get_llm_service()
+        self.vector_service = get_vector_service()
+        self.db_service = get_database_service()
+        self._urgent_vec = None
+        self._summary_cache = {}
 
     async def answer_query(
         self,
@@ -25,12 +33,12 @@ class RAGAgent:
     ) -> dict:
         """Answer a query using RAG."""
         try:
-            # Get relevant context from vector database
-            relevant_context = await self.vector_service.get_relevant_context(
+            # Single embedding + vector search serving both context and sources
+            relevant_context, sources = await self.vector_service.query_with_sources(
                 query,
                 top_k=top_k
             )
-            
+
             if not relevant_context:
                 return {
                     "answer": "I don't have enough information to answer that question. Please try rephrasing or check if emails have been processed.",
@@ -43,10 +51,7 @@ class RAGAgent:
                 question=query,
                 context=relevant_context
             )
-            
-            # Get source emails
-            sources = await self.vector_service.search_similar_emails(query, top_k=3)
-            
+
             return {
                 "answer": answer,
                 "sources": sources,
@@ -67,7 +72,20 @@ class RAGAgent:
             
             if not emails:
                 return "Your inbox is empty."
-            
+
+            # Reuse the previous summary while the inbox content is unchanged
+            cache_key = hashlib.blake2b(
+                b"|".join(
+                    f"{e.id}:{e.timestamp.timestamp()}:{e.category.value}".encode()
+                    for e in sorted(emails, key=lambda e: e.id)
+                ),
+                digest_size=16
+            ).digest()
+
+            cached_summary = self._summary_cache.get(cache_key)
+            if cached_summary is not None:
+                return cached_summary
+
             # Prepare summary prompt
             email_summaries = []
             for email in emails[:10]:  # Limit to 10 for summary
@@ -85,7 +103,11 @@ Recent emails:
 Provide a brief summary (2-3 sentences) of the inbox status and key items:"""
 
             summary = await self.llm_service.generate_text(prompt, temperature=0.5)
-            
+
+            if len(self._summary_cache) >= 16:
+                self._summary_cache.pop(next(iter(self._summary_cache)))
+            self._summary_cache[cache_key] = summary
+
             return summary
         except Exception as e:
             logger.error(f"Error summarizing inbox: {e}")
@@ -94,10 +116,12 @@ Provide a brief summary (2-3 sentences) of the inbox status and key items:"""
     async def find_urgent_emails(self) -> str:
         """Find and summarize urgent emails."""
         try:
-            query = "urgent important immediate action required critical"
-            
-            results = await self.vector_service.search_similar_emails(
-                query,
+            # Embed the fixed query once and reuse the vector on later calls
+            if self._urgent_vec is None:
+                self._urgent_vec = await self.vector_service.embed(URGENT_QUERY)
+
+            results = await self.vector_service.search_by_vector(
+                self._urgent_vec,
                 top_k=5
             )
             
@@ -117,11 +141,14 @@ Provide a brief summary (2-3 sentences) of the inbox status and key items:"""
             logger.error(f"Error finding urgent emails: {e}")
             return "Error finding urgent emails."
 
+    @async_ttl_cache(ttl_seconds=30)
     async def get_emails_by_sender(self, sender: str) -> str:
         """Get emails from a specific sender."""
         try:
+            # Anchored, escaped prefix match so Mongo can walk the sender
+            # index instead of scanning the collection
             emails = await self.db_service.search_emails(
-                {"sender": {"$regex": sender, "$options": "i"}},
+                {"sender": {"$regex": f"^{re.escape(sender)}", "$options": "i"}},
                 limit=10
             )
             
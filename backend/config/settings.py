@@ -1,6 +1,7 @@
 """Application configuration management."""
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import ClassVar, Optional
 
 
 class Settings(BaseSettings):
@@ -33,12 +34,23 @@ class Settings(BaseSettings):
 
     # Application Settings
     log_level: str = "INFO"
+    llm_max_concurrency: int = 20
+    batch_concurrency: int = 10
+    llm_window_size: int = 100
+    llm_requests_per_minute: int = 60
+    llm_batch_size: int = 32
+    llm_batch_delay: float = 0.05
     max_emails_display: int = 50
+    query_cache_ttl: int = 3600
+    embedding_cache_size: int = 2048
+    embedding_cache_path: str = ".cache/embeddings.npz"
     chunk_size: int = 1000
     chunk_overlap: int = 200
 
     # Email Processing
-    default_category_prompt: str = """You are an email categorization assistant. 
+    # Fixed prompt defaults: ClassVar keeps pydantic-settings from validating
+    # them or checking env overrides on every Settings() construction
+    default_category_prompt: ClassVar[str] = """You are an email categorization assistant.
     Categorize the email into one of these categories: 
     - URGENT: Requires immediate attention
     - ACTION_REQUIRED: Needs response or action
@@ -47,7 +59,7 @@ class Settings(BaseSettings):
     
     Provide category and brief reason."""
 
-    default_action_prompt: str = """Extract action items from this email. 
+    default_action_prompt: ClassVar[str] = """Extract action items from this email.
     List each action item with:
     - Description of the task
     - Priority (High/Medium/Low)
@@ -55,7 +67,7 @@ class Settings(BaseSettings):
     
     If no action items, respond with "No action items found"."""
 
-    default_reply_prompt: str = """Draft a professional email reply based on:
+    default_reply_prompt: ClassVar[str] = """Draft a professional email reply based on:
     - Original email context
     - Professional and courteous tone
     - Address all key points
@@ -64,5 +76,11 @@ class Settings(BaseSettings):
     Do not include subject line."""
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the shared Settings instance, constructed once."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
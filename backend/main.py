@@ -3,7 +3,10 @@ import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+from uuid import uuid4
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from backend.config.settings import settings
@@ -11,11 +14,14 @@ from backend.models.email import Email, EmailCategory
 from backend.models.prompt import PromptConfig
 from backend.models.draft import EmailDraft
 from backend.services.email_service import EmailService
-from backend.services.database_service import DatabaseService
+from backend.services.database_service import get_database_service
+from backend.services.vector_service import get_vector_service
 from backend.agents.categorization_agent import CategorizationAgent
 from backend.agents.action_item_agent import ActionItemAgent
 from backend.agents.draft_agent import DraftAgent
 from backend.agents.rag_agent import RAGAgent
+from backend.utils.background import flush_pending_writes
+from backend.utils.ttl_cache import async_ttl_cache
 
 # Configure logging
 logging.basicConfig(
@@ -24,7 +30,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Email Productivity Agent Backend")
+# orjson serializes responses (datetimes included) natively in C, several
+# times faster than the default json path on the list-heavy endpoints
+app = FastAPI(
+    title="Email Productivity Agent Backend",
+    default_response_class=ORJSONResponse
+)
 
 class EmailProductivityBackend:
     """Main backend orchestrator."""
@@ -32,7 +43,7 @@ class EmailProductivityBackend:
     def __init__(self):
         """Initialize backend services and agents."""
         self.email_service = EmailService()
-        self.db_service = DatabaseService()
+        self.db_service = get_database_service()
         
         # Initialize agents
         self.categorization_agent = CategorizationAgent()
@@ -78,6 +89,7 @@ class EmailProductivityBackend:
             )
             
             logger.info(f"Processed {len(processed_emails)} emails")
+            self._invalidate_query_caches()
             return processed_emails
         except Exception as e:
             logger.error(f"Error loading and processing emails: {e}")
@@ -103,45 +115,54 @@ class EmailProductivityBackend:
     # Prompt Management
     async def save_prompt_config(self, prompt_config: PromptConfig) -> str:
         """Save prompt configuration."""
-        return await self.db_service.save_prompt(prompt_config)
+        prompt_id = await self.db_service.save_prompt(prompt_config)
+        self._invalidate_query_caches()
+        return prompt_id
 
     async def get_prompt_configs(self) -> List[PromptConfig]:
         """Get all prompt configurations."""
         return await self.db_service.get_all_prompts()
 
     async def get_active_prompts(self) -> dict:
-        """Get all active prompts."""
-        cat_prompt = await self.db_service.get_active_prompt("categorization")
-        action_prompt = await self.db_service.get_active_prompt("action_item")
-        reply_prompt = await self.db_service.get_active_prompt("reply_draft")
-        
-        return {
-            "categorization": cat_prompt,
-            "action_item": action_prompt,
-            "reply_draft": reply_prompt
-        }
+        """Get all active prompts in a single database round-trip."""
+        return await self.db_service.get_active_prompts()
 
     # Phase 2: Email Processing Agent (RAG)
+    # Repeated identical queries skip the whole embed + vector search + LLM
+    # pipeline; caches are dropped whenever emails or prompts change
+    @async_ttl_cache(ttl_seconds=settings.query_cache_ttl)
     async def query_inbox(self, query: str) -> dict:
         """Query inbox using RAG agent."""
         return await self.rag_agent.answer_query(query)
 
+    @async_ttl_cache(ttl_seconds=settings.query_cache_ttl)
     async def get_inbox_summary(self) -> str:
         """Get inbox summary."""
         return await self.rag_agent.summarize_inbox()
 
+    @async_ttl_cache(ttl_seconds=settings.query_cache_ttl)
     async def find_urgent_emails(self) -> str:
         """Find urgent emails."""
         return await self.rag_agent.find_urgent_emails()
 
+    @async_ttl_cache(ttl_seconds=settings.query_cache_ttl)
     async def search_by_sender(self, sender: str) -> str:
         """Search emails by sender."""
         return await self.rag_agent.get_emails_by_sender(sender)
 
+    @async_ttl_cache(ttl_seconds=settings.query_cache_ttl)
     async def search_by_topic(self, topic: str) -> str:
         """Search emails by topic."""
         return await self.rag_agent.search_emails_by_topic(topic)
 
+    def _invalidate_query_caches(self):
+        """Drop cached RAG answers after emails or prompts change."""
+        self.query_inbox.invalidate()
+        self.get_inbox_summary.invalidate()
+        self.find_urgent_emails.invalidate()
+        self.search_by_sender.invalidate()
+        self.search_by_topic.invalidate()
+
     async def summarize_email(self, email_id: str) -> str:
         """Get email summary."""
         return await self.email_service.get_email_summary(email_id)
@@ -177,6 +198,25 @@ class EmailProductivityBackend:
             context=context
         )
 
+    def astream_new_draft(
+        self,
+        recipient: str,
+        subject: str,
+        instructions: str,
+        context: Optional[str] = None
+    ):
+        """Stream a new email draft's body chunk by chunk.
+
+        Returns the DraftAgent async iterator: body text chunks first,
+        then the persisted EmailDraft as the final item.
+        """
+        return self.draft_agent.astream_new_draft(
+            recipient=recipient,
+            subject=subject,
+            instructions=instructions,
+            context=context
+        )
+
     async def refine_draft(
         self,
         draft_id: str,
@@ -233,25 +273,111 @@ backend = EmailProductivityBackend()
 async def startup_event():
     """Initialize backend resources on startup."""
     logger.info("Starting up Email Productivity Agent Backend...")
+    await backend.db_service.init_indexes()
+    # Warm the shared vector service (Pinecone index check, embedding
+    # client, on-disk embedding cache) off the request path so the first
+    # /emails/process doesn't pay the cold start. Multi-worker deploys
+    # should pass --preload so the warmed state is fork-shared
+    await asyncio.to_thread(get_vector_service)
     # You might want to trigger initial data loading here if appropriate
     # await backend.load_and_process_emails()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush background persistence writes before the process exits."""
+    await flush_pending_writes()
+
+def _check_etag(request: Request, response: Response, *parts) -> bool:
+    """Set ETag/Cache-Control headers; True when the client copy is current.
+
+    The first part is the collection version bumped on every write, so
+    unchanged polls answer 304 without recomputing the body.
+    """
+    etag = '"' + "-".join(str(part) for part in parts) + '"'
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=30"
+    return request.headers.get("if-none-match") == etag
+
 @app.get("/")
 async def root():
     return {"message": "Email Productivity Agent Backend is running"}
 
-@app.post("/emails/process")
-async def process_emails(source: str = "mock"):
+# Processing jobs run in the background so a burst of submissions can't
+# hold HTTP requests open for the multi-second LLM pipeline; the LLM
+# semaphore and token bucket bound how fast queued jobs actually run
+_process_jobs: dict = {}
+_process_tasks: set = set()
+_MAX_TRACKED_JOBS = 100
+
+async def _run_process_job(job_id: str, source: str):
+    """Execute one email-processing job and record its outcome."""
+    _process_jobs[job_id]["status"] = "running"
     try:
         emails = await backend.load_and_process_emails(source=source)
-        return {"message": f"Processed {len(emails)} emails", "count": len(emails)}
+        _process_jobs[job_id].update(status="done", count=len(emails))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Processing job {job_id} failed: {e}")
+        _process_jobs[job_id].update(status="failed", error=str(e))
+
+@app.post("/emails/process", status_code=202)
+async def process_emails(source: str = "mock"):
+    job_id = uuid4().hex
+    while len(_process_jobs) >= _MAX_TRACKED_JOBS:
+        _process_jobs.pop(next(iter(_process_jobs)))
+    _process_jobs[job_id] = {"job_id": job_id, "status": "queued"}
+
+    task = asyncio.create_task(_run_process_job(job_id, source))
+    _process_tasks.add(task)
+    task.add_done_callback(_process_tasks.discard)
+
+    return {"job_id": job_id, "status_url": f"/emails/process/{job_id}"}
+
+@app.get("/emails/process/{job_id}")
+async def get_process_job(job_id: str):
+    job = _process_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @app.get("/emails", response_model=List[Email])
-async def get_emails(category: Optional[EmailCategory] = None, skip: int = 0, limit: int = 50):
+async def get_emails(
+    request: Request,
+    response: Response,
+    category: Optional[EmailCategory] = None,
+    skip: int = 0,
+    limit: int = 50
+):
+    if _check_etag(
+        request, response,
+        backend.db_service.data_version,
+        category.value if category else "all", skip, limit
+    ):
+        return Response(status_code=304)
     return await backend.get_emails(category, skip, limit)
 
+@app.get("/emails/stream")
+async def stream_emails(
+    category: Optional[EmailCategory] = None,
+    limit: Optional[int] = None,
+    fields: Optional[str] = None
+):
+    """Stream emails as newline-delimited JSON without buffering the list.
+
+    An optional comma-separated fields projection ships only those fields
+    from Mongo and skips model validation entirely.
+    """
+    field_list = fields.split(",") if fields else None
+
+    async def _ndjson():
+        async for item in backend.db_service.iter_emails(
+            limit=limit, category=category, fields=field_list
+        ):
+            if not isinstance(item, dict):
+                item = item.model_dump(mode='json')
+            yield orjson.dumps(item) + b"\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
 @app.get("/emails/{email_id}", response_model=Email)
 async def get_email(email_id: str):
     email = await backend.get_email_by_id(email_id)
@@ -260,7 +386,9 @@ async def get_email(email_id: str):
     return email
 
 @app.get("/inbox/summary")
-async def get_inbox_summary():
+async def get_inbox_summary(request: Request, response: Response):
+    if _check_etag(request, response, backend.db_service.data_version, "summary"):
+        return Response(status_code=304)
     summary = await backend.get_inbox_summary()
     return {"summary": summary}
 
@@ -269,11 +397,22 @@ async def query_inbox(q: str):
     return await backend.query_inbox(q)
 
 @app.get("/action-items")
-async def get_action_items(include_completed: bool = False):
+async def get_action_items(
+    request: Request,
+    response: Response,
+    include_completed: bool = False
+):
+    if _check_etag(
+        request, response,
+        backend.db_service.data_version, "actions", include_completed
+    ):
+        return Response(status_code=304)
     return await backend.get_all_action_items(include_completed)
 
 @app.get("/drafts", response_model=List[EmailDraft])
-async def get_drafts():
+async def get_drafts(request: Request, response: Response):
+    if _check_etag(request, response, backend.db_service.data_version, "drafts"):
+        return Response(status_code=304)
     return await backend.get_all_drafts()
 
 # Main entry point for testing
@@ -3,10 +3,12 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from backend.utils.ids import new_id
+
 
 class EmailDraft(BaseModel):
     """Email draft model."""
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     original_email_id: Optional[str] = None
     recipient: str
     subject: str
@@ -22,13 +24,7 @@ class EmailDraft(BaseModel):
     # Status
     is_sent: bool = False
     is_saved: bool = True
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-    
+
     def to_json_metadata(self) -> Dict[str, Any]:
         """Export draft with metadata as JSON."""
         return {
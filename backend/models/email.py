@@ -1,9 +1,12 @@
 """Email data models."""
 from pydantic import BaseModel, Field
 from datetime import datetime
+from functools import cached_property
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
+from backend.utils.ids import new_id
+
 
 class EmailCategory(str, Enum):
     """Email category types."""
@@ -24,7 +27,7 @@ class ActionItem(BaseModel):
 
 class Email(BaseModel):
     """Email data model."""
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     sender: str
     recipient: str
     subject: str
@@ -45,12 +48,35 @@ class Email(BaseModel):
     
     # Vector search
     embedding_id: Optional[str] = None
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+
+    @cached_property
+    def body_preview(self) -> str:
+        """First 300 characters of the body, sliced once per email."""
+        return self.body[:300]
+
+    @cached_property
+    def preview(self) -> str:
+        """Short display preview for list views, built once per email."""
+        return self.body[:100] + "..." if len(self.body) > 100 else self.body
+
+    @cached_property
+    def formatted_timestamp(self) -> str:
+        """Display timestamp, formatted once per email (strftime with
+        month names does locale dispatch on every call)."""
+        return self.timestamp.strftime("%b %d, %Y %I:%M %p")
+
+    @cached_property
+    def formatted_content(self) -> str:
+        """Canonical text block passed to LLM prompts (built once per email)."""
+        return f"""
+Subject: {self.subject}
+From: {self.sender}
+To: {self.recipient}
+Date: {self.timestamp}
+
+Body:
+{self.body}
+"""
 
 
 class EmailBatch(BaseModel):
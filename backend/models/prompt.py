@@ -3,10 +3,12 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
+from backend.utils.ids import new_id
+
 
 class PromptConfig(BaseModel):
     """Prompt configuration for agents."""
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     name: str
     prompt_type: str  # categorization, action_item, reply_draft
     prompt_text: str
@@ -14,12 +16,6 @@ class PromptConfig(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
     is_active: bool = True
     version: int = 1
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class PromptLibrary(BaseModel):
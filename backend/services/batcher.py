@@ -0,0 +1,87 @@
+"""Dynamic batching of concurrent single-item calls."""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class DynBatcher:
+    """Coalesce concurrent single-item calls into one batched call.
+
+    Calls that arrive within a max_delay window (up to max_batch_size of
+    them) are buffered and flushed together through the supplied flush
+    coroutine, which receives the list of payloads and must return one
+    result per payload, in order. A flush coroutine that can fail for a
+    subset of its payloads may return an Exception instance in that
+    payload's slot; only the affected callers see it, the rest get their
+    results. Buffers and futures are kept per event
+    loop because futures bind to the loop that created them and the
+    frontend creates a fresh loop per interaction.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_delay: float = 0.05
+    ):
+        """Initialize batcher around a flush coroutine."""
+        self._flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._buffers = {}
+        # Strong references so pending drain tasks aren't garbage collected
+        self._drain_tasks = set()
+
+    async def submit(self, payload: Any) -> Any:
+        """Queue one payload and wait for its result from the next flush."""
+        loop = asyncio.get_running_loop()
+        buffer = self._buffers.setdefault(loop, [])
+        future = loop.create_future()
+        buffer.append((payload, future))
+
+        if len(buffer) >= self.max_batch_size:
+            # Full batch: flush immediately instead of waiting out the window
+            del self._buffers[loop]
+            await self._flush_batch(buffer)
+        elif len(buffer) == 1:
+            # First item opens the batching window
+            task = loop.create_task(self._drain_later(loop))
+            self._drain_tasks.add(task)
+            task.add_done_callback(self._drain_tasks.discard)
+
+        return await future
+
+    async def _drain_later(self, loop):
+        """Flush whatever accumulated once the batching window closes."""
+        await asyncio.sleep(self.max_delay)
+        batch = self._buffers.pop(loop, [])
+        await self._flush_batch(batch)
+
+    async def _flush_batch(self, batch):
+        """Run the flush coroutine and resolve each waiting future."""
+        if not batch:
+            return
+        payloads = [payload for payload, _ in batch]
+        try:
+            results = await self._flush(payloads)
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch flush returned {len(results)} results "
+                    f"for {len(batch)} payloads"
+                )
+        except Exception as e:
+            logger.error(f"Error flushing batch of {len(batch)}: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
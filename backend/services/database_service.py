@@ -1,9 +1,15 @@
 """MongoDB database service."""
-from pymongo import MongoClient, ASCENDING, DESCENDING
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.collation import Collation
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 
+from pydantic import TypeAdapter
+
 from backend.config.settings import settings
 from backend.models.email import Email, EmailCategory
 from backend.models.prompt import PromptConfig
@@ -11,40 +17,97 @@ from backend.models.draft import EmailDraft
 
 logger = logging.getLogger(__name__)
 
+# Serializers compiled once at import: dump_python on a TypeAdapter uses
+# pydantic's core-schema fast path and skips the per-call encoder lookup
+# that model_dump pays on every write
+_EMAIL_TA = TypeAdapter(Email)
+_PROMPT_TA = TypeAdapter(PromptConfig)
+_DRAFT_TA = TypeAdapter(EmailDraft)
+
 
 class DatabaseService:
     """Service for MongoDB operations."""
 
     def __init__(self):
-        """Initialize MongoDB client."""
-        self.client = MongoClient(settings.mongodb_uri)
-        self.db = self.client[settings.mongodb_database]
-        
-        # Collections
-        self.emails = self.db.emails
-        self.prompts = self.db.prompts
-        self.drafts = self.db.drafts
-        
-        # Create indexes
-        self._create_indexes()
-
-    def _create_indexes(self):
-        """Create database indexes."""
+        """Initialize per-loop MongoDB client storage.
+
+        Motor issues every collection operation asynchronously, so awaiting
+        a query no longer blocks the event loop the way the old synchronous
+        pymongo calls did. Clients bind to the event loop active when first
+        used, and the frontend creates a fresh loop per interaction, so one
+        client is kept per loop (same pattern as the LLMService semaphores).
+        """
+        self._clients = {}
+        # Bumped on every write; read endpoints fold it into ETags so
+        # unchanged polls can answer 304 without recomputing bodies
+        self.data_version = 0
+        # Change tokens for active-prompt memoization: save_prompt bumps the
+        # type's version, so cached lookups (including cached "no active
+        # prompt" results) drop the moment a prompt changes, with no TTL lag
+        self._prompt_versions: Dict[str, int] = {}
+        self._active_prompt_cache: Dict[str, tuple] = {}
+
+    def _database(self):
+        """Return the database handle for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = AsyncIOMotorClient(settings.mongodb_uri)
+            self._clients[loop] = client
+        return client[settings.mongodb_database]
+
+    # Collections
+    @property
+    def emails(self):
+        """Emails collection bound to the running loop."""
+        return self._database().emails
+
+    @property
+    def prompts(self):
+        """Prompts collection bound to the running loop."""
+        return self._database().prompts
+
+    @property
+    def drafts(self):
+        """Drafts collection bound to the running loop."""
+        return self._database().drafts
+
+    async def init_indexes(self):
+        """Create database indexes; call once at application startup."""
         try:
             # Email indexes
-            self.emails.create_index([("id", ASCENDING)], unique=True)
-            self.emails.create_index([("sender", ASCENDING)])
-            self.emails.create_index([("timestamp", DESCENDING)])
-            self.emails.create_index([("category", ASCENDING)])
-            
+            await self.emails.create_index([("id", ASCENDING)], unique=True)
+            # Case-insensitive sender lookups (collation strength 2)
+            await self.emails.create_index(
+                [("sender", ASCENDING)],
+                name="sender_ci",
+                collation=Collation(locale="en", strength=2)
+            )
+            await self.emails.create_index([("timestamp", DESCENDING)])
+            # Compound indexes match the filter + sort of the listing and
+            # sender queries, so Mongo walks one bounded index range instead
+            # of intersecting indexes or sorting in memory
+            await self.emails.create_index([
+                ("category", ASCENDING),
+                ("timestamp", DESCENDING)
+            ])
+            await self.emails.create_index([
+                ("sender", ASCENDING),
+                ("timestamp", DESCENDING)
+            ])
+            await self.emails.create_index([
+                ("id", ASCENDING),
+                ("action_items.description", ASCENDING)
+            ])
+
             # Prompt indexes
-            self.prompts.create_index([("id", ASCENDING)], unique=True)
-            self.prompts.create_index([("prompt_type", ASCENDING)])
-            
+            await self.prompts.create_index([("id", ASCENDING)], unique=True)
+            await self.prompts.create_index([("prompt_type", ASCENDING)])
+
             # Draft indexes
-            self.drafts.create_index([("id", ASCENDING)], unique=True)
-            self.drafts.create_index([("original_email_id", ASCENDING)])
-            
+            await self.drafts.create_index([("id", ASCENDING)], unique=True)
+            await self.drafts.create_index([("original_email_id", ASCENDING)])
+
             logger.info("Database indexes created successfully")
         except Exception as e:
             logger.warning(f"Error creating indexes: {e}")
@@ -53,21 +116,42 @@ class DatabaseService:
     async def save_email(self, email: Email) -> str:
         """Save email to database."""
         try:
-            email_dict = email.model_dump(mode='json')
-            self.emails.update_one(
+            email_dict = _EMAIL_TA.dump_python(email, mode='json')
+            await self.emails.update_one(
                 {"id": email.id},
                 {"$set": email_dict},
                 upsert=True
             )
+            self.data_version += 1
             return email.id
         except Exception as e:
             logger.error(f"Error saving email: {e}")
             raise
 
+    async def save_emails(self, emails: List[Email]) -> int:
+        """Bulk upsert emails in a single round-trip."""
+        if not emails:
+            return 0
+        try:
+            operations = [
+                UpdateOne(
+                    {"id": email.id},
+                    {"$set": _EMAIL_TA.dump_python(email, mode='json')},
+                    upsert=True
+                )
+                for email in emails
+            ]
+            await self.emails.bulk_write(operations, ordered=False)
+            self.data_version += 1
+            return len(emails)
+        except Exception as e:
+            logger.error(f"Error bulk saving emails: {e}")
+            raise
+
     async def get_email(self, email_id: str) -> Optional[Email]:
         """Get email by ID."""
         try:
-            result = self.emails.find_one({"id": email_id})
+            result = await self.emails.find_one({"id": email_id})
             if result:
                 result.pop('_id', None)
                 return Email(**result)
@@ -80,26 +164,71 @@ class DatabaseService:
         self,
         skip: int = 0,
         limit: int = 50,
-        category: Optional[EmailCategory] = None
+        category: Optional[EmailCategory] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Email]:
-        """Get all emails with optional filtering."""
+        """Get all emails with optional filtering.
+
+        When fields is given, Mongo only ships those fields and raw dicts
+        are returned, skipping Pydantic validation for callers that don't
+        need full Email objects.
+        """
         try:
             query = {}
             if category:
                 query["category"] = category.value
-            
-            cursor = self.emails.find(query).sort("timestamp", DESCENDING).skip(skip).limit(limit)
-            
+
+            projection = {field: 1 for field in fields} if fields else None
+            if projection:
+                projection["_id"] = 0
+
+            cursor = self.emails.find(query, projection).sort("timestamp", DESCENDING).skip(skip).limit(limit)
+
+            if fields:
+                return [doc async for doc in cursor]
+
             emails = []
-            for doc in cursor:
+            async for doc in cursor:
                 doc.pop('_id', None)
                 emails.append(Email(**doc))
-            
+
             return emails
         except Exception as e:
             logger.error(f"Error getting all emails: {e}")
             return []
 
+    async def iter_emails(
+        self,
+        limit: Optional[int] = None,
+        category: Optional[EmailCategory] = None,
+        fields: Optional[List[str]] = None
+    ):
+        """Stream emails one at a time instead of materializing a full list.
+
+        As with get_all_emails, a fields projection yields raw dicts.
+        """
+        try:
+            query = {}
+            if category:
+                query["category"] = category.value
+
+            projection = {field: 1 for field in fields} if fields else None
+            if projection:
+                projection["_id"] = 0
+
+            cursor = self.emails.find(query, projection).sort("timestamp", DESCENDING)
+            if limit:
+                cursor = cursor.limit(limit)
+
+            async for doc in cursor:
+                if fields:
+                    yield doc
+                else:
+                    doc.pop('_id', None)
+                    yield Email(**doc)
+        except Exception as e:
+            logger.error(f"Error iterating emails: {e}")
+
     async def search_emails(
         self,
         query: Dict[str, Any],
@@ -109,24 +238,95 @@ class DatabaseService:
         """Search emails with custom query."""
         try:
             cursor = self.emails.find(query).sort("timestamp", DESCENDING).skip(skip).limit(limit)
-            
+
             emails = []
-            for doc in cursor:
+            async for doc in cursor:
                 doc.pop('_id', None)
                 emails.append(Email(**doc))
-            
+
             return emails
         except Exception as e:
             logger.error(f"Error searching emails: {e}")
             return []
 
+    async def complete_action_item(self, email_id: str, description: str) -> bool:
+        """Mark a matching action item complete with a single targeted update."""
+        try:
+            result = await self.emails.update_one(
+                {"id": email_id, "action_items.description": description},
+                {"$set": {"action_items.$.completed": True}}
+            )
+            if result.matched_count > 0:
+                self.data_version += 1
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"Error completing action item: {e}")
+            return False
+
+    async def aggregate_action_items(
+        self,
+        include_completed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Flatten and sort action items server-side via aggregation.
+
+        Returns None on failure so callers can fall back to a Python-side scan.
+        """
+        try:
+            pipeline = [
+                {"$match": {"action_items": {"$ne": []}}},
+                {"$unwind": "$action_items"},
+            ]
+            if not include_completed:
+                pipeline.append({"$match": {"action_items.completed": False}})
+            pipeline.extend([
+                {"$project": {
+                    "_id": 0,
+                    "email_id": "$id",
+                    "email_subject": "$subject",
+                    "email_sender": "$sender",
+                    "action_item": "$action_items"
+                }},
+                {"$addFields": {
+                    "_priority": {
+                        "$indexOfArray": [
+                            ["High", "Medium", "Low"],
+                            "$action_item.priority"
+                        ]
+                    }
+                }},
+                # $indexOfArray yields -1 for unknown priorities; sort those last
+                {"$addFields": {
+                    "_priority": {
+                        "$cond": [{"$eq": ["$_priority", -1]}, 3, "$_priority"]
+                    }
+                }},
+                {"$sort": {"_priority": 1}},
+                {"$project": {"_priority": 0}},
+            ])
+            return await self.emails.aggregate(pipeline).to_list(None)
+        except Exception as e:
+            logger.error(f"Error aggregating action items: {e}")
+            return None
+
+    async def category_counts(self) -> Dict[str, int]:
+        """Count emails per category with a single \\$group aggregation."""
+        try:
+            cursor = self.emails.aggregate([
+                {"$group": {"_id": "$category", "count": {"$sum": 1}}}
+            ])
+            return {doc["_id"]: doc["count"] async for doc in cursor}
+        except Exception as e:
+            logger.error(f"Error counting emails per category: {e}")
+            return {}
+
     async def get_email_count(self, category: Optional[EmailCategory] = None) -> int:
         """Get email count."""
         try:
             query = {}
             if category:
                 query["category"] = category.value
-            return self.emails.count_documents(query)
+            return await self.emails.count_documents(query)
         except Exception as e:
             logger.error(f"Error getting email count: {e}")
             return 0
@@ -135,42 +335,84 @@ class DatabaseService:
     async def save_prompt(self, prompt: PromptConfig) -> str:
         """Save prompt configuration."""
         try:
-            prompt_dict = prompt.model_dump(mode='json')
-            self.prompts.update_one(
+            prompt_dict = _PROMPT_TA.dump_python(prompt, mode='json')
+            await self.prompts.update_one(
                 {"id": prompt.id},
                 {"$set": prompt_dict},
                 upsert=True
             )
+            # Bump the change token so the new prompt takes effect immediately
+            self._prompt_versions[prompt.prompt_type] = (
+                self._prompt_versions.get(prompt.prompt_type, 0) + 1
+            )
+            self.data_version += 1
             return prompt.id
         except Exception as e:
             logger.error(f"Error saving prompt: {e}")
             raise
 
     async def get_active_prompt(self, prompt_type: str) -> Optional[PromptConfig]:
-        """Get active prompt by type."""
+        """Get active prompt by type, memoized until the type's token changes."""
+        version = self._prompt_versions.get(prompt_type, 0)
+        cached = self._active_prompt_cache.get(prompt_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
         try:
-            result = self.prompts.find_one({
+            result = await self.prompts.find_one({
                 "prompt_type": prompt_type,
                 "is_active": True
             })
+            prompt = None
             if result:
                 result.pop('_id', None)
-                return PromptConfig(**result)
-            return None
+                prompt = PromptConfig(**result)
+            self._active_prompt_cache[prompt_type] = (version, prompt)
+            return prompt
         except Exception as e:
             logger.error(f"Error getting active prompt: {e}")
             return None
 
+    async def get_active_prompts(
+        self,
+        prompt_types: tuple = ("categorization", "action_item", "reply_draft")
+    ) -> Dict[str, Optional[PromptConfig]]:
+        """Fetch the active prompt for several types in one aggregation."""
+        result: Dict[str, Optional[PromptConfig]] = {
+            prompt_type: None for prompt_type in prompt_types
+        }
+        try:
+            pipeline = [
+                {"$match": {
+                    "is_active": True,
+                    "prompt_type": {"$in": list(prompt_types)}
+                }},
+                {"$group": {"_id": "$prompt_type", "doc": {"$first": "$$ROOT"}}}
+            ]
+            async for group in self.prompts.aggregate(pipeline):
+                doc = group["doc"]
+                doc.pop('_id', None)
+                result[group["_id"]] = PromptConfig(**doc)
+
+            # Seed the per-type memo so follow-up single lookups are free
+            for prompt_type in prompt_types:
+                version = self._prompt_versions.get(prompt_type, 0)
+                self._active_prompt_cache[prompt_type] = (version, result[prompt_type])
+            return result
+        except Exception as e:
+            logger.error(f"Error getting active prompts: {e}")
+            return result
+
     async def get_all_prompts(self) -> List[PromptConfig]:
         """Get all prompts."""
         try:
             cursor = self.prompts.find().sort("created_at", DESCENDING)
-            
+
             prompts = []
-            for doc in cursor:
+            async for doc in cursor:
                 doc.pop('_id', None)
                 prompts.append(PromptConfig(**doc))
-            
+
             return prompts
         except Exception as e:
             logger.error(f"Error getting all prompts: {e}")
@@ -181,21 +423,42 @@ class DatabaseService:
         """Save email draft."""
         try:
             draft.updated_at = datetime.now()
-            draft_dict = draft.model_dump(mode='json')
-            self.drafts.update_one(
+            draft_dict = _DRAFT_TA.dump_python(draft, mode='json')
+            await self.drafts.update_one(
                 {"id": draft.id},
                 {"$set": draft_dict},
                 upsert=True
             )
+            self.data_version += 1
             return draft.id
         except Exception as e:
             logger.error(f"Error saving draft: {e}")
             raise
 
+    async def update_draft_fields(self, draft_id: str, **changes) -> bool:
+        """Partially update a draft, writing only the changed fields.
+
+        Avoids re-serializing the whole draft when the edit touched a
+        couple of fields; updated_at is stamped as part of the $set.
+        """
+        if not changes:
+            return False
+        try:
+            changes["updated_at"] = datetime.now().isoformat()
+            result = await self.drafts.update_one(
+                {"id": draft_id},
+                {"$set": changes}
+            )
+            self.data_version += 1
+            return result.matched_count > 0
+        except Exception as e:
+            logger.error(f"Error updating draft fields: {e}")
+            raise
+
     async def get_draft(self, draft_id: str) -> Optional[EmailDraft]:
         """Get draft by ID."""
         try:
-            result = self.drafts.find_one({"id": draft_id})
+            result = await self.drafts.find_one({"id": draft_id})
             if result:
                 result.pop('_id', None)
                 return EmailDraft(**result)
@@ -212,12 +475,12 @@ class DatabaseService:
         """Get all drafts."""
         try:
             cursor = self.drafts.find().sort("updated_at", DESCENDING).skip(skip).limit(limit)
-            
+
             drafts = []
-            for doc in cursor:
+            async for doc in cursor:
                 doc.pop('_id', None)
                 drafts.append(EmailDraft(**doc))
-            
+
             return drafts
         except Exception as e:
             logger.error(f"Error getting all drafts: {e}")
@@ -226,8 +489,15 @@ class DatabaseService:
     async def delete_draft(self, draft_id: str):
         """Delete draft."""
         try:
-            self.drafts.delete_one({"id": draft_id})
+            await self.drafts.delete_one({"id": draft_id})
+            self.data_version += 1
             logger.info(f"Deleted draft {draft_id}")
         except Exception as e:
             logger.error(f"Error deleting draft: {e}")
             raise
+
+
+@lru_cache(maxsize=1)
+def get_database_service() -> DatabaseService:
+    """Return the shared DatabaseService instance, constructed once."""
+    return DatabaseService()
@@ -0,0 +1,93 @@
+"""Response cache for LLM calls."""
+import functools
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel distinguishing "no cached value" from a cached falsy value
+_MISS = object()
+
+
+class LLMCache:
+    """Two-tier cache for LLM responses.
+
+    Tier 1 is an exact-match in-process store keyed by a SHA-256 hash of the
+    namespace plus call arguments. Tier 2 is an optional embedding-similarity
+    backend (e.g. backed by VectorService) that can be registered at runtime
+    to serve near-identical requests without coupling this module to Pinecone.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        """Initialize cache."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._store = {}
+        self._similarity_lookup: Optional[Callable[[str], Any]] = None
+
+    def make_key(self, namespace: str, args: tuple, kwargs: dict) -> str:
+        """Build a stable exact-match key from call arguments."""
+        raw = repr((namespace, args, sorted(kwargs.items())))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Get cached value, or the miss sentinel."""
+        entry = self._store.get(key)
+        if entry is None:
+            return _MISS
+        value, expiry = entry
+        if time.monotonic() >= expiry:
+            self._store.pop(key, None)
+            return _MISS
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store value, evicting oldest entries when full."""
+        while len(self._store) >= self.max_entries:
+            self._store.pop(next(iter(self._store)))
+        self._store[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def register_similarity_backend(self, lookup: Callable[[str], Any]):
+        """Register an embedding-similarity fallback lookup."""
+        self._similarity_lookup = lookup
+
+    def similarity_get(self, text: str) -> Any:
+        """Query the similarity backend if one is registered."""
+        if self._similarity_lookup is None:
+            return _MISS
+        try:
+            result = self._similarity_lookup(text)
+            return result if result is not None else _MISS
+        except Exception as e:
+            logger.warning(f"Similarity cache lookup failed: {e}")
+            return _MISS
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._store.clear()
+
+
+# Shared cache instance used by all LLMService methods
+llm_cache = LLMCache()
+
+
+def semantic_cached(namespace: str):
+    """Decorator caching async LLM method results by namespace + arguments."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = llm_cache.make_key(namespace, args, kwargs)
+            cached = llm_cache.get(key)
+            if cached is not _MISS:
+                logger.debug(f"LLM cache hit for namespace {namespace}")
+                return cached
+
+            result = await func(self, *args, **kwargs)
+            llm_cache.set(key, result)
+            return result
+
+        wrapper.cache = llm_cache
+        return wrapper
+    return decorator
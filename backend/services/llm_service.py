@@ -1,14 +1,34 @@
 """Gemini LLM service integration."""
+import asyncio
+import re
 import google.generativeai as genai
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
-from tenacity import retry, stop_after_attempt, wait_exponential
-import json
+from tenacity import retry, stop_after_attempt, wait_random_exponential
+import orjson
 import logging
 
 from backend.config.settings import settings
+from backend.services.batcher import DynBatcher
+from backend.services.llm_cache import semantic_cached
+from backend.services.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fences the model sometimes wraps JSON responses in
+_CODE_FENCE_RE = re.compile(r'\A\s*```(?:json)?\s*|\s*```\s*\Z')
+
+
+def _parse_json_response(response: str) -> Any:
+    """Parse a JSON LLM response, tolerating markdown code fences.
+
+    One compiled-regex pass strips the fences and orjson does the decode;
+    both are noticeably faster than the previous strip/slice plus stdlib
+    json on large batch responses. Raises orjson.JSONDecodeError (a
+    json.JSONDecodeError subclass) on malformed output.
+    """
+    return orjson.loads(_CODE_FENCE_RE.sub('', response))
+
 
 class LLMService:
     """Service for interacting with Google Gemini LLM."""
@@ -17,10 +37,60 @@ class LLMService:
         """Initialize Gemini service."""
         genai.configure(api_key=settings.gemini_api_key)
         self.model = genai.GenerativeModel(settings.gemini_model)
-        
+        # Self-throttle to the provider's request rate so concurrent batch
+        # passes wait locally instead of burning 429 retries
+        self._bucket = TokenBucket(
+            capacity=settings.llm_requests_per_minute,
+            refill_rate=settings.llm_requests_per_minute / 60.0
+        )
+        # Semaphores bind to the event loop they first run on, and the
+        # frontend creates a fresh loop per interaction, so keep one per loop
+        self._semaphores = {}
+        # Concurrent categorize/extract calls (e.g. from process_email_batch)
+        # coalesce into one multi-email prompt per batching window
+        self._categorize_batcher = DynBatcher(
+            self._categorize_batch,
+            max_batch_size=settings.llm_batch_size,
+            max_delay=settings.llm_batch_delay
+        )
+        self._action_item_batcher = DynBatcher(
+            self._extract_action_items_batch,
+            max_batch_size=settings.llm_batch_size,
+            max_delay=settings.llm_batch_delay
+        )
+        # Only a handful of (temperature, max_tokens) pairs ever occur, so
+        # reuse the GenerationConfig objects instead of building one per call
+        self._generation_configs: Dict[tuple, genai.GenerationConfig] = {}
+
+    def _generation_config(
+        self,
+        temperature: float,
+        max_tokens: int
+    ) -> genai.GenerationConfig:
+        """Return a shared GenerationConfig for the given parameters."""
+        key = (temperature, max_tokens)
+        config = self._generation_configs.get(key)
+        if config is None:
+            config = genai.GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_tokens,
+            )
+            self._generation_configs[key] = config
+        return config
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    @semantic_cached("generate")
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=0.5, max=8)
     )
     async def generate_text(
         self,
@@ -30,27 +100,74 @@ class LLMService:
     ) -> str:
         """Generate text completion."""
         try:
-            generation_config = genai.GenerationConfig(
-                temperature=temperature or settings.gemini_temperature,
-                max_output_tokens=max_tokens or settings.gemini_max_tokens,
-            )
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
+            generation_config = self._generation_config(
+                temperature or settings.gemini_temperature,
+                max_tokens or settings.gemini_max_tokens
             )
-            
+
+            async with self._get_semaphore():
+                await self._bucket.acquire()
+                # Native async call: the request awaits on the event loop
+                # instead of blocking it (or a worker thread) per call
+                response = await self.model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config
+                )
+
             return response.text
         except Exception as e:
             logger.error(f"Error generating text: {e}")
             raise
 
+    @semantic_cached("categorize")
     async def categorize_email(
         self,
         email_content: str,
         custom_prompt: Optional[str] = None
     ) -> Dict[str, str]:
         """Categorize email using LLM."""
+        return await self._categorize_batcher.submit((email_content, custom_prompt))
+
+    async def _categorize_batch(
+        self,
+        payloads: List[tuple]
+    ) -> List[Dict[str, str]]:
+        """Flush a window of categorize calls, multi-prompting where possible."""
+        results: List[Optional[Dict[str, str]]] = [None] * len(payloads)
+        # Only calls sharing a custom prompt can share a request
+        groups: Dict[Optional[str], List[int]] = {}
+        for i, (_, custom_prompt) in enumerate(payloads):
+            groups.setdefault(custom_prompt, []).append(i)
+
+        for custom_prompt, indices in groups.items():
+            # A failing group must not poison the other groups in this
+            # window: the exception lands only on its own callers
+            try:
+                if len(indices) == 1:
+                    results[indices[0]] = await self._categorize_one(
+                        payloads[indices[0]][0], custom_prompt
+                    )
+                else:
+                    batch_results = await self._categorize_many(
+                        [payloads[i][0] for i in indices], custom_prompt
+                    )
+                    for position, i in enumerate(indices):
+                        results[i] = batch_results[position]
+            except Exception as e:
+                logger.error(
+                    f"Categorize group of {len(indices)} failed: {e}"
+                )
+                for i in indices:
+                    results[i] = e
+
+        return results
+
+    async def _categorize_one(
+        self,
+        email_content: str,
+        custom_prompt: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Categorize a single email in one request."""
         prompt = custom_prompt or settings.default_category_prompt
         full_prompt = f"""{prompt}
 
@@ -66,25 +183,104 @@ Respond in JSON format:
         response = await self.generate_text(full_prompt, temperature=0.3)
         
         try:
-            # Extract JSON from response
-            response_clean = response.strip()
-            if response_clean.startswith("```json"):
-                response_clean = response_clean[7:]
-            if response_clean.endswith("```"):
-                response_clean = response_clean[:-3]
-            
-            result = json.loads(response_clean.strip())
-            return result
-        except json.JSONDecodeError:
+            return _parse_json_response(response)
+        except orjson.JSONDecodeError:
             logger.warning(f"Failed to parse JSON from categorization: {response}")
             return {"category": "UNCATEGORIZED", "reason": "Unable to categorize"}
 
+    async def _categorize_many(
+        self,
+        email_contents: List[str],
+        custom_prompt: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Categorize several emails with one multi-prompt request."""
+        prompt = custom_prompt or settings.default_category_prompt
+        emails_block = "\n\n".join(
+            f"Email {i + 1}:\n{content}"
+            for i, content in enumerate(email_contents)
+        )
+        full_prompt = f"""{prompt}
+
+Apply the task above to each of the following emails independently.
+
+{emails_block}
+
+Respond in JSON format with one result per email:
+{{
+    "results": [
+        {{
+            "index": 1,
+            "category": "URGENT|ACTION_REQUIRED|INFORMATIONAL|SPAM",
+            "reason": "brief explanation"
+        }}
+    ]
+}}"""
+
+        fallback = {"category": "UNCATEGORIZED", "reason": "Unable to categorize"}
+        response = await self.generate_text(full_prompt, temperature=0.3)
+
+        try:
+            parsed = _parse_json_response(response)
+            by_index = {
+                item.get("index"): item for item in parsed.get("results", [])
+            }
+            return [
+                {
+                    "category": by_index.get(i + 1, fallback).get("category", "UNCATEGORIZED"),
+                    "reason": by_index.get(i + 1, fallback).get("reason", "")
+                }
+                for i in range(len(email_contents))
+            ]
+        except orjson.JSONDecodeError:
+            logger.warning(f"Failed to parse JSON from batch categorization: {response}")
+            return [dict(fallback) for _ in email_contents]
+
+    @semantic_cached("action_items")
     async def extract_action_items(
         self,
         email_content: str,
         custom_prompt: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Extract action items from email."""
+        return await self._action_item_batcher.submit((email_content, custom_prompt))
+
+    async def _extract_action_items_batch(
+        self,
+        payloads: List[tuple]
+    ) -> List[List[Dict[str, Any]]]:
+        """Flush a window of extract calls, multi-prompting where possible."""
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(payloads)
+        groups: Dict[Optional[str], List[int]] = {}
+        for i, (_, custom_prompt) in enumerate(payloads):
+            groups.setdefault(custom_prompt, []).append(i)
+
+        for custom_prompt, indices in groups.items():
+            try:
+                if len(indices) == 1:
+                    results[indices[0]] = await self._extract_action_items_one(
+                        payloads[indices[0]][0], custom_prompt
+                    )
+                else:
+                    batch_results = await self._extract_action_items_many(
+                        [payloads[i][0] for i in indices], custom_prompt
+                    )
+                    for position, i in enumerate(indices):
+                        results[i] = batch_results[position]
+            except Exception as e:
+                logger.error(
+                    f"Action-item group of {len(indices)} failed: {e}"
+                )
+                for i in indices:
+                    results[i] = e
+
+        return results
+
+    async def _extract_action_items_one(
+        self,
+        email_content: str,
+        custom_prompt: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract action items from a single email in one request."""
         prompt = custom_prompt or settings.default_action_prompt
         full_prompt = f"""{prompt}
 
@@ -105,18 +301,111 @@ Respond in JSON format:
         response = await self.generate_text(full_prompt, temperature=0.3)
         
         try:
-            response_clean = response.strip()
-            if response_clean.startswith("```json"):
-                response_clean = response_clean[7:]
-            if response_clean.endswith("```"):
-                response_clean = response_clean[:-3]
-            
-            result = json.loads(response_clean.strip())
-            return result.get("action_items", [])
-        except json.JSONDecodeError:
+            return _parse_json_response(response).get("action_items", [])
+        except orjson.JSONDecodeError:
             logger.warning(f"Failed to parse JSON from action items: {response}")
             return []
 
+    async def _extract_action_items_many(
+        self,
+        email_contents: List[str],
+        custom_prompt: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Extract action items from several emails with one request."""
+        prompt = custom_prompt or settings.default_action_prompt
+        emails_block = "\n\n".join(
+            f"Email {i + 1}:\n{content}"
+            for i, content in enumerate(email_contents)
+        )
+        full_prompt = f"""{prompt}
+
+Apply the task above to each of the following emails independently.
+
+{emails_block}
+
+Respond in JSON format with one result per email:
+{{
+    "results": [
+        {{
+            "index": 1,
+            "action_items": [
+                {{
+                    "description": "task description",
+                    "priority": "High|Medium|Low",
+                    "deadline": "deadline if mentioned or null"
+                }}
+            ]
+        }}
+    ]
+}}"""
+
+        response = await self.generate_text(full_prompt, temperature=0.3)
+
+        try:
+            parsed = _parse_json_response(response)
+            by_index = {
+                item.get("index"): item for item in parsed.get("results", [])
+            }
+            return [
+                by_index.get(i + 1, {}).get("action_items", [])
+                for i in range(len(email_contents))
+            ]
+        except orjson.JSONDecodeError:
+            logger.warning(f"Failed to parse JSON from batch action items: {response}")
+            return [[] for _ in email_contents]
+
+    @semantic_cached("analyze")
+    async def analyze_email(
+        self,
+        email_content: str,
+        custom_prompts: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Categorize, extract action items and suggest follow-ups in one call."""
+        prompts = custom_prompts or {}
+        category_prompt = prompts.get("categorization") or settings.default_category_prompt
+        action_prompt = prompts.get("action_item") or settings.default_action_prompt
+
+        full_prompt = f"""Perform all of the following tasks on the email below.
+
+Task 1 - Categorization:
+{category_prompt}
+
+Task 2 - Action items:
+{action_prompt}
+
+Task 3 - Follow-ups:
+Suggest 2-3 brief follow-up actions for this email.
+
+Email Content:
+{email_content}
+
+Respond in JSON format:
+{{
+    "category": "URGENT|ACTION_REQUIRED|INFORMATIONAL|SPAM",
+    "reason": "brief explanation",
+    "action_items": [
+        {{
+            "description": "task description",
+            "priority": "High|Medium|Low",
+            "deadline": "deadline if mentioned or null"
+        }}
+    ],
+    "followups": ["follow-up action"]
+}}"""
+
+        response = await self.generate_text(full_prompt, temperature=0.3)
+
+        try:
+            return _parse_json_response(response)
+        except orjson.JSONDecodeError:
+            logger.warning(f"Failed to parse JSON from analysis: {response}")
+            return {
+                "category": "UNCATEGORIZED",
+                "reason": "Unable to analyze",
+                "action_items": [],
+                "followups": []
+            }
+
     async def draft_reply(
         self,
         original_email: str,
@@ -139,6 +428,7 @@ Draft Reply:"""
         response = await self.generate_text(full_prompt, temperature=0.7)
         return response.strip()
 
+    @semantic_cached("answer")
     async def answer_question(
         self,
         question: str,
@@ -164,20 +454,31 @@ Answer:"""
     ):
         """Generate text with streaming."""
         try:
-            generation_config = genai.GenerationConfig(
-                temperature=temperature or settings.gemini_temperature,
-                max_output_tokens=settings.gemini_max_tokens,
+            generation_config = self._generation_config(
+                temperature or settings.gemini_temperature,
+                settings.gemini_max_tokens
             )
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                stream=True
-            )
-            
-            for chunk in response:
+
+            # A streamed request is still one request against the RPM
+            # budget; the semaphore covers call initiation only so a
+            # slow consumer doesn't pin a concurrency slot for the
+            # stream's whole lifetime
+            async with self._get_semaphore():
+                await self._bucket.acquire()
+                response = await self.model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config,
+                    stream=True
+                )
+
+            async for chunk in response:
                 if chunk.text:
                     yield chunk.text
         except Exception as e:
             logger.error(f"Error in streaming generation: {e}")
-            raise
\ No newline at end of file
+            raise
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """Return the shared LLMService instance, constructed once."""
+    return LLMService()
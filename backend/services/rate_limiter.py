@@ -0,0 +1,39 @@
+"""Token-bucket rate limiting for outbound LLM requests."""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket that self-throttles callers to a refill rate.
+
+    Requests wait locally until a token is available instead of hitting the
+    provider's rate limit and paying exponential-backoff retries. Only
+    monotonic-clock arithmetic and asyncio.sleep are used, so one instance
+    works across the short-lived event loops the frontend creates.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """Initialize bucket with capacity tokens refilled at refill_rate/s."""
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        """Credit tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._last_refill) * self.refill_rate
+        )
+        self._last_refill = now
+
+    async def acquire(self, cost: float = 1.0):
+        """Wait until cost tokens are available, then consume them."""
+        while True:
+            self._refill()
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return
+            deficit = cost - self._tokens
+            await asyncio.sleep(deficit / self.refill_rate)
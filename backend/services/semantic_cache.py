@@ -0,0 +1,103 @@
+"""Embedding-keyed semantic cache for LLM results."""
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Two-layer cache: exact content match, then cosine-similarity probe.
+
+    Layer 1 keys on SHA256 of the content so byte-identical inputs hit
+    without an embedding. Layer 2 stores unit-normalized embeddings per
+    namespace and returns the cached value of the nearest neighbour when
+    its cosine similarity clears the threshold — near-duplicate bodies
+    (recurring notifications, marketing templates) reuse earlier LLM
+    output. The store is a brute-force numpy matrix per namespace; at the
+    few-thousand-entry scale this app caches, a matrix product beats the
+    overhead of an ANN index dependency.
+    """
+
+    def __init__(self, threshold: float = 0.95, maxsize: int = 1024):
+        """Initialize cache with a cosine threshold and per-layer size cap."""
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._exact: Dict[str, Any] = {}
+        # namespace -> ((n, dim) matrix of unit rows, parallel value list)
+        self._stores: Dict[str, tuple] = {}
+
+    @staticmethod
+    def content_key(content: str, namespace: str = "") -> str:
+        """Exact-match key for a content/namespace pair."""
+        return hashlib.sha256(f"{namespace}\x00{content}".encode()).hexdigest()
+
+    def get(
+        self,
+        content: str,
+        embedding: Optional[List[float]] = None,
+        namespace: str = ""
+    ) -> Optional[Any]:
+        """Return a cached value for exact or near-duplicate content."""
+        exact = self._exact.get(self.content_key(content, namespace))
+        if exact is not None:
+            return exact
+
+        if embedding is None:
+            return None
+
+        store = self._stores.get(namespace)
+        if not store or not store[1]:
+            return None
+
+        matrix, values = store
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        similarities = matrix @ (vector / norm)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return values[best]
+        return None
+
+    def put(
+        self,
+        content: str,
+        embedding: Optional[List[float]],
+        value: Any,
+        namespace: str = ""
+    ):
+        """Cache a value under the content hash and, if given, its embedding."""
+        if len(self._exact) >= self.maxsize:
+            self._exact.pop(next(iter(self._exact)))
+        self._exact[self.content_key(content, namespace)] = value
+
+        if embedding is None:
+            return
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        row = (vector / norm).reshape(1, -1)
+
+        store = self._stores.get(namespace)
+        if store is None:
+            self._stores[namespace] = (row, [value])
+            return
+        matrix, values = store
+        if len(values) >= self.maxsize:
+            matrix = matrix[1:]
+            values = values[1:]
+        self._stores[namespace] = (np.vstack([matrix, row]), values + [value])
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._exact.clear()
+        self._stores.clear()
+
+
+# Shared cache for the per-email categorize/extract pipeline
+email_semantic_cache = SemanticCache()
@@ -1,13 +1,44 @@
 """Pinecone vector database service for RAG."""
+import asyncio
+import hashlib
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
 from pinecone import Pinecone, ServerlessSpec
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 import logging
 
+import numpy as np
+
 from backend.config.settings import settings
+from backend.services.batcher import DynBatcher
 
 logger = logging.getLogger(__name__)
 
+# Persist the on-disk cache after this many new embeddings
+_PERSIST_EVERY = 100
+
+# Candidate pool fetched from Pinecone for local re-ranking
+_RERANK_POOL = 30
+
+
+def _chunks(iterable, size: int):
+    """Yield successive lists of up to size items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@lru_cache(maxsize=1)
+def _get_embeddings() -> GoogleGenerativeAIEmbeddings:
+    """Construct the shared embeddings client once per process."""
+    return GoogleGenerativeAIEmbeddings(
+        model=settings.embedding_model,
+        google_api_key=settings.gemini_api_key
+    )
+
 
 class VectorService:
     """Service for Pinecone vector operations."""
@@ -18,15 +49,57 @@ class VectorService:
         self.index_name = settings.pinecone_index_name
         self.dimension = settings.pinecone_dimension
         
-        # Initialize embedding model
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/text-embedding-004",
-            google_api_key=settings.gemini_api_key
-        )
+        # Embedding model is shared process-wide; repeated VectorService
+        # construction (tests, scripts) must never load a second client
+        self.embeddings = _get_embeddings()
         
         # Ensure index exists
         self._ensure_index_exists()
-        self.index = self.pc.Index(self.index_name)
+        # pool_threads lets chunked upserts with async_req=True overlap on
+        # the wire instead of serializing one round-trip per chunk
+        self.index = self.pc.Index(self.index_name, pool_threads=30)
+
+        # Embeddings keyed by content hash: re-ingesting the same body
+        # (mock reloads, reprocessing) skips the embedding API round-trip.
+        # The cache survives restarts via a small npz file
+        self._embedding_cache: OrderedDict = OrderedDict()
+        self._cache_path = Path(settings.embedding_cache_path)
+        self._new_since_persist = 0
+        self._load_embedding_cache()
+
+        # Concurrent embed calls coalesce into one embed_documents request
+        # executed in a worker thread, so the blocking HTTP call neither
+        # stalls the event loop nor runs once per caller
+        self._embed_batcher = DynBatcher(
+            self._embed_batch,
+            max_batch_size=64,
+            max_delay=0.02
+        )
+
+    def _load_embedding_cache(self):
+        """Warm the in-memory embedding cache from disk, if present."""
+        try:
+            if self._cache_path.exists():
+                data = np.load(self._cache_path)
+                for key, vector in zip(data["keys"], data["vectors"]):
+                    self._embedding_cache[str(key)] = vector.astype(np.float16)
+                logger.info(
+                    f"Loaded {len(self._embedding_cache)} cached embeddings"
+                )
+        except Exception as e:
+            logger.warning(f"Could not load embedding cache: {e}")
+
+    def _persist_embedding_cache(self):
+        """Write the in-memory embedding cache to disk, best effort."""
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                self._cache_path,
+                keys=np.array(list(self._embedding_cache.keys())),
+                vectors=np.stack(list(self._embedding_cache.values()))
+            )
+        except Exception as e:
+            logger.warning(f"Could not persist embedding cache: {e}")
 
     def _ensure_index_exists(self):
         """Create index if it doesn't exist."""
@@ -49,24 +122,90 @@ class VectorService:
             logger.error(f"Error ensuring index exists: {e}")
             raise
 
-    def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding using LangChain wrapper."""
-        try:
-            return self.embeddings.embed_query(text)
-        except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
-            raise
+    def _cached_embedding(self, text: str) -> Optional[List[float]]:
+        """Look up an embedding in the content-hash cache."""
+        key = self._content_key(text)
+        cached = self._embedding_cache.get(key)
+        if cached is None:
+            return None
+        self._embedding_cache.move_to_end(key)
+        # Upcast on the way out; consumers (Pinecone, similarity math)
+        # expect full-precision floats
+        return cached.astype(np.float32).tolist()
+
+    @staticmethod
+    def _content_key(text: str) -> str:
+        """Content-hash cache key for a text, namespaced by model.
+
+        The model name is part of the hashed bytes so a model switch can
+        never serve vectors embedded by the previous model.
+        """
+        return hashlib.sha256(
+            f"{settings.embedding_model}\x00{text}".encode()
+        ).hexdigest()
+
+    def _store_embedding(self, text: str, embedding: List[float]):
+        """Cache an embedding by content hash, persisting periodically.
+
+        Vectors are kept (and persisted) as FP16: cosine similarity is
+        stable at half precision and the cache takes half the RAM and
+        disk of FP32 lists.
+        """
+        self._embedding_cache[self._content_key(text)] = np.asarray(
+            embedding, dtype=np.float16
+        )
+        while len(self._embedding_cache) > settings.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+        self._new_since_persist += 1
+        if self._new_since_persist >= _PERSIST_EVERY:
+            self._persist_embedding_cache()
+            self._new_since_persist = 0
+
+    async def embed(self, text: str) -> List[float]:
+        """Generate an embedding, batching concurrent calls off the loop."""
+        cached = self._cached_embedding(text)
+        if cached is not None:
+            return cached
+        return await self._embed_batcher.submit(text)
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a window of texts with one blocking call in a worker thread."""
+        # Duplicates and entries cached since submission share one embed
+        by_text: Dict[str, List[float]] = {}
+        for text in texts:
+            cached = self._cached_embedding(text)
+            if cached is not None:
+                by_text[text] = cached
+        pending = list(dict.fromkeys(
+            text for text in texts if text not in by_text
+        ))
+
+        if pending:
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.embeddings.embed_documents, pending
+                )
+            except Exception as e:
+                logger.error(f"Error generating embeddings: {e}")
+                raise
+            for text, embedding in zip(pending, embeddings):
+                by_text[text] = embedding
+                self._store_embedding(text, embedding)
+
+        return [by_text[text] for text in texts]
 
     async def upsert_email(
         self,
         email_id: str,
         email_content: str,
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        embedding: Optional[List[float]] = None
     ) -> str:
         """Upsert email into vector database."""
         try:
-            embedding = self._generate_embedding(email_content)
-            
+            if embedding is None:
+                embedding = await self.embed(email_content)
+
             self.index.upsert(
                 vectors=[
                     {
@@ -83,6 +222,66 @@ class VectorService:
             logger.error(f"Error upserting email: {e}")
             raise
 
+    async def upsert_many(
+        self,
+        items: List[Dict[str, Any]],
+        embed_batch_size: int = 64,
+        upsert_batch_size: int = 100
+    ) -> List[str]:
+        """Upsert many emails with batched embed and upsert round-trips.
+
+        Each item carries id, content and metadata; precomputed or cached
+        embeddings skip the API, and the remaining texts go through
+        embed_documents in embed_batch_size chunks — one HTTP call per
+        chunk instead of one per email. Vectors then upsert in
+        upsert_batch_size chunks.
+        """
+        if not items:
+            return []
+        try:
+            # Resolve what we already have (precomputed or content-hash hit)
+            embeddings: List[Optional[List[float]]] = [
+                item.get("embedding") or self._cached_embedding(item["content"])
+                for item in items
+            ]
+
+            pending = list(dict.fromkeys(
+                item["content"]
+                for item, embedding in zip(items, embeddings)
+                if embedding is None
+            ))
+            by_text: Dict[str, List[float]] = {}
+            for chunk in _chunks(pending, embed_batch_size):
+                vectors = await asyncio.to_thread(
+                    self.embeddings.embed_documents, chunk
+                )
+                for text, vector in zip(chunk, vectors):
+                    by_text[text] = vector
+                    self._store_embedding(text, vector)
+
+            vectors = [
+                {
+                    "id": item["id"],
+                    "values": embedding or by_text[item["content"]],
+                    "metadata": item["metadata"]
+                }
+                for item, embedding in zip(items, embeddings)
+            ]
+
+            # Dispatch all chunks onto the client's thread pool, then wait
+            # once; errors surface through .get()
+            handles = [
+                self.index.upsert(vectors=chunk, async_req=True)
+                for chunk in _chunks(vectors, upsert_batch_size)
+            ]
+            await asyncio.to_thread(lambda: [handle.get() for handle in handles])
+
+            logger.info(f"Upserted {len(vectors)} emails to vector DB")
+            return [vector["id"] for vector in vectors]
+        except Exception as e:
+            logger.error(f"Error bulk upserting emails: {e}")
+            raise
+
     async def search_similar_emails(
         self,
         query: str,
@@ -90,16 +289,53 @@ class VectorService:
         filter_dict: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar emails."""
+        query_embedding = await self.embed(query)
+        return await self.search_by_vector(
+            query_embedding,
+            top_k=top_k,
+            filter_dict=filter_dict
+        )
+
+    async def batch_search(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches with one embed pass and concurrent queries.
+
+        All query texts embed together (concurrent embed calls coalesce in
+        the batcher) and the index queries run side by side on worker
+        threads, so n searches cost roughly one round-trip of each kind.
+        """
+        if not queries:
+            return []
+        embeddings = await asyncio.gather(
+            *(self.embed(query) for query in queries)
+        )
+        return list(await asyncio.gather(*(
+            self.search_by_vector(vector, top_k=top_k, filter_dict=filter_dict)
+            for vector in embeddings
+        )))
+
+    async def search_by_vector(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search with a precomputed query vector, skipping the embedding call."""
         try:
-            query_embedding = self._generate_embedding(query)
-            
-            results = self.index.query(
-                vector=query_embedding,
+            # Off the loop so concurrent searches (batch_search, parallel
+            # agent calls) overlap on the wire instead of serializing
+            results = await asyncio.to_thread(
+                self.index.query,
+                vector=vector,
                 top_k=top_k,
                 include_metadata=True,
                 filter=filter_dict
             )
-            
+
             return [
                 {
                     "id": match.id,
@@ -121,14 +357,77 @@ class VectorService:
             logger.error(f"Error deleting email: {e}")
             raise
 
+    async def query_with_sources(
+        self,
+        query: str,
+        top_k: int = 5
+    ) -> tuple[str, List[Dict[str, Any]]]:
+        """Search once and derive both context text and source hits.
+
+        Embeds the query a single time and reuses one result set, instead of
+        issuing separate searches for context and sources.
+        """
+        results = await self.search_similar_emails(query, top_k=top_k)
+
+        context_parts = []
+        for result in results:
+            metadata = result.get("metadata", {})
+            email_text = f"""
+Subject: {metadata.get('subject', 'N/A')}
+From: {metadata.get('sender', 'N/A')}
+Content: {metadata.get('body_preview', 'N/A')}
+"""
+            context_parts.append(email_text.strip())
+
+        return "\n\n---\n\n".join(context_parts), results
+
     async def get_relevant_context(
         self,
         query: str,
         top_k: int = 3
     ) -> str:
-        """Get relevant context for query."""
-        results = await self.search_similar_emails(query, top_k=top_k)
-        
+        """Get relevant context for query, re-ranking a wider pool locally.
+
+        Fetches a candidate pool with vectors included and picks the final
+        top_k by exact cosine similarity in one BLAS matvec — a single
+        normalized matrix product plus an O(N) argpartition, no
+        per-candidate Python arithmetic.
+        """
+        query_embedding = await self.embed(query)
+        try:
+            response = await asyncio.to_thread(
+                self.index.query,
+                vector=query_embedding,
+                top_k=max(_RERANK_POOL, top_k),
+                include_metadata=True,
+                include_values=True
+            )
+            matches = response.matches
+        except Exception as e:
+            logger.error(f"Error searching similar emails: {e}")
+            raise
+
+        if len(matches) > top_k:
+            candidates = np.asarray(
+                [match.values for match in matches], dtype=np.float32
+            )
+            query_vec = np.asarray(query_embedding, dtype=np.float32)
+            query_vec /= np.linalg.norm(query_vec) or 1.0
+            norms = np.linalg.norm(candidates, axis=1, keepdims=True)
+            norms[norms == 0.0] = 1.0
+            scores = (candidates / norms) @ query_vec
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            matches = [matches[i] for i in top[np.argsort(-scores[top])]]
+
+        results = [
+            {
+                "id": match.id,
+                "score": match.score,
+                "metadata": match.metadata
+            }
+            for match in matches
+        ]
+
         context_parts = []
         for result in results:
             metadata = result.get("metadata", {})
@@ -140,3 +439,9 @@ Content: {metadata.get('body_preview', 'N/A')}
             context_parts.append(email_text.strip())
         
         return "\n\n---\n\n".join(context_parts)
+
+
+@lru_cache(maxsize=1)
+def get_vector_service() -> VectorService:
+    """Return the shared VectorService instance, constructed once."""
+    return VectorService()
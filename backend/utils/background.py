@@ -0,0 +1,30 @@
+"""Fire-and-forget background task tracking for persistence writes."""
+import asyncio
+import logging
+from typing import Coroutine
+
+logger = logging.getLogger(__name__)
+
+# Strong references keep scheduled tasks alive until they finish
+_pending_writes: set = set()
+
+
+def schedule_write(coro: Coroutine) -> asyncio.Task:
+    """Run a persistence coroutine in the background.
+
+    Callers get their result back immediately while the write overlaps with
+    subsequent work; use flush_pending_writes() to wait for completion.
+    """
+    task = asyncio.create_task(coro)
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    return task
+
+
+async def flush_pending_writes():
+    """Wait for all scheduled background writes to finish."""
+    if _pending_writes:
+        results = await asyncio.gather(*_pending_writes, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Background write failed: {result}")
@@ -0,0 +1,19 @@
+"""Sortable unique ID generation."""
+import os
+import time
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def new_id() -> str:
+    """Return a 26-character ULID (48-bit ms timestamp + 80 random bits).
+
+    Lexicographically sortable by creation time like the old
+    str(datetime.now().timestamp()) ids, but collision-safe when many
+    models are constructed in the same instant during batch ingest.
+    """
+    value = (int(time.time() * 1000) << 80) | int.from_bytes(os.urandom(10), "big")
+    return "".join(
+        _CROCKFORD[(value >> shift) & 0x1F]
+        for shift in range(125, -1, -5)
+    )
@@ -0,0 +1,36 @@
+"""TTL memoization for async callables."""
+import functools
+import time
+from typing import Callable
+
+
+def async_ttl_cache(ttl_seconds: float, maxsize: int = 128) -> Callable:
+    """Cache an async function's results for ttl_seconds.
+
+    Keys are built from the call arguments (including ``self`` for methods).
+    Entries live in a plain dict guarded by the GIL, so the decorator stays
+    safe across the short-lived event loops the frontend creates. The wrapped
+    function gains an ``invalidate()`` helper that drops all cached entries,
+    for callers that just wrote through to the underlying store.
+    """
+    def decorator(func):
+        cache = {}
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            entry = cache.get(key)
+            now = time.monotonic()
+            if entry is not None and now < entry[1]:
+                return entry[0]
+
+            value = await func(*args, **kwargs)
+
+            if len(cache) >= maxsize:
+                cache.pop(next(iter(cache)))
+            cache[key] = (value, now + ttl_seconds)
+            return value
+
+        wrapper.invalidate = cache.clear
+        return wrapper
+    return decorator
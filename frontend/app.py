@@ -1,6 +1,5 @@
 """Main Streamlit application for Email Productivity Agent."""
 import streamlit as st
-import asyncio
 import sys
 from pathlib import Path
 
@@ -10,6 +9,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 try:
     from backend.main import EmailProductivityBackend
     from backend.models.email import EmailCategory
+    from frontend.runtime import run_async
     from frontend.components.email_list import render_email_list, render_email_details
     from frontend.components.prompt_editor import render_prompt_editor
     from frontend.components.agent_chat import render_agent_chat
@@ -77,7 +77,10 @@ def initialize_session_state():
     
     if 'emails' not in st.session_state:
         st.session_state.emails = []
-    
+
+    if 'emails_by_id' not in st.session_state:
+        st.session_state.emails_by_id = {}
+
     if 'selected_email_id' not in st.session_state:
         st.session_state.selected_email_id = None
     
@@ -116,11 +119,8 @@ def render_sidebar(backend):
         st.sidebar.subheader("📊 Inbox Statistics")
         
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            stats = loop.run_until_complete(backend.get_category_statistics())
-            loop.close()
-            
+            stats = run_async(backend.get_category_statistics())
+
             total = sum(stats.values())
             st.sidebar.metric("Total Emails", total)
             
@@ -165,16 +165,9 @@ def load_emails(backend):
     """Load and process emails."""
     with st.spinner("Loading and processing emails..."):
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            emails = loop.run_until_complete(
-                backend.load_and_process_emails(source="mock")
-            )
-            
-            loop.close()
-            
-            st.session_state.emails = emails
+            emails = run_async(backend.load_and_process_emails(source="mock"))
+
+            set_emails(emails)
             st.session_state.emails_loaded = True
             
             st.success(f"✅ Successfully loaded and processed {len(emails)} emails!")
@@ -188,15 +181,10 @@ def refresh_data(backend):
     """Refresh email data from database."""
     with st.spinner("Refreshing data..."):
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            emails = loop.run_until_complete(backend.get_emails())
-            active_prompts = loop.run_until_complete(backend.get_active_prompts())
-            
-            loop.close()
-            
-            st.session_state.emails = emails
+            emails = run_async(backend.get_emails())
+            active_prompts = run_async(backend.get_active_prompts())
+
+            set_emails(emails)
             st.session_state.active_prompts = active_prompts
             st.session_state.emails_loaded = len(emails) > 0
             
@@ -207,6 +195,28 @@ def refresh_data(backend):
             st.error(f"❌ Error refreshing data: {str(e)}")
 
 
+def set_emails(emails):
+    """Store the email list along with its id -> index lookup table.
+
+    The index makes selection a dict lookup instead of a linear scan of
+    the whole inbox on every rerun.
+    """
+    st.session_state.emails = emails
+    st.session_state.emails_by_id = {
+        email.id: i for i, email in enumerate(emails)
+    }
+    # Prepay the per-email display strings at load time so the first
+    # list render doesn't do N slice/strftime calls
+    for email in emails:
+        email.preview
+        email.formatted_timestamp
+    # Invalidate anything memoized against the email list (filter/sort
+    # orders, derived arrays)
+    st.session_state.emails_version = (
+        st.session_state.get("emails_version", 0) + 1
+    )
+
+
 def on_email_select(email_id: str):
     """Callback for email selection."""
     st.session_state.selected_email_id = email_id
@@ -282,13 +292,15 @@ def render_inbox_tab(backend):
     
     with col2:
         if st.session_state.selected_email_id:
-            # Get selected email
-            selected_email = next(
-                (e for e in st.session_state.emails 
-                 if e.id == st.session_state.selected_email_id),
-                None
+            # O(1) lookup via the id -> index table instead of scanning
+            # the whole inbox on every rerun
+            index = st.session_state.emails_by_id.get(
+                st.session_state.selected_email_id
             )
-            
+            selected_email = (
+                st.session_state.emails[index] if index is not None else None
+            )
+
             if selected_email:
                 render_email_details(selected_email)
                 
@@ -320,15 +332,8 @@ def summarize_email(backend, email_id: str):
     """Summarize selected email."""
     with st.spinner("Generating summary..."):
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            summary = loop.run_until_complete(
-                backend.summarize_email(email_id)
-            )
-            
-            loop.close()
-            
+            summary = run_async(backend.summarize_email(email_id))
+
             st.info(f"📝 **Summary:** {summary}")
             
         except Exception as e:
@@ -1,7 +1,9 @@
 """Agent chat interface component."""
 import streamlit as st
 from typing import List, Dict
-import asyncio
+from uuid import uuid4
+
+from frontend.runtime import run_async
 
 
 def render_agent_chat(backend):
@@ -68,32 +70,37 @@ def render_agent_chat(backend):
         st.rerun()
 
 
+@st.cache_data(show_spinner=False)
+def _render_msg_html(msg_id: str, role: str, content: str) -> str:
+    """Build the HTML for one chat message, memoized by message id.
+
+    Every rerun redraws the whole history; the stable per-message id lets
+    st.cache_data hand back the formatted HTML instead of rebuilding it
+    for each keystroke as the chat grows.
+    """
+    label = "You" if role == 'user' else "Agent"
+    css_class = "user" if role == 'user' else "agent"
+    return f"""
+    <div class="chat-message {css_class}">
+        <strong>{label}:</strong> {content}
+    </div>
+    """
+
+
 def render_chat_message(message: Dict):
     """Render individual chat message."""
-    
+
     role = message.get('role', 'user')
     content = message.get('content', '')
     sources = message.get('sources', [])
-    
-    if role == 'user':
-        st.markdown(
-            f"""
-            <div class="chat-message user">
-                <strong>You:</strong> {content}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    else:
-        st.markdown(
-            f"""
-            <div class="chat-message agent">
-                <strong>Agent:</strong> {content}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        
+    msg_id = message.get('id', '')
+
+    st.markdown(
+        _render_msg_html(msg_id, role, content),
+        unsafe_allow_html=True
+    )
+
+    if role != 'user':
         # Show sources if available
         if sources:
             with st.expander("📎 Sources"):
@@ -111,30 +118,26 @@ def process_chat_message(backend, user_input: str):
     
     # Add user message to history
     st.session_state.chat_history.append({
+        'id': str(uuid4()),
         'role': 'user',
         'content': user_input
     })
-    
+
     try:
         # Process with backend
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        response = loop.run_until_complete(
-            backend.query_inbox(user_input)
-        )
-        
-        loop.close()
-        
+        response = run_async(backend.query_inbox(user_input))
+
         # Add agent response to history
         st.session_state.chat_history.append({
+            'id': str(uuid4()),
             'role': 'agent',
             'content': response.get('answer', 'No response'),
             'sources': response.get('sources', [])
         })
-        
+
     except Exception as e:
         st.session_state.chat_history.append({
+            'id': str(uuid4()),
             'role': 'agent',
             'content': f"Error: {str(e)}",
             'sources': []
@@ -145,32 +148,29 @@ def process_quick_action(backend, action_type: str):
     """Process quick action button."""
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         if action_type == "summarize_inbox":
-            response = loop.run_until_complete(backend.get_inbox_summary())
+            response = run_async(backend.get_inbox_summary())
             user_message = "Summarize my inbox"
         elif action_type == "find_urgent":
-            response = loop.run_until_complete(backend.find_urgent_emails())
+            response = run_async(backend.find_urgent_emails())
             user_message = "Show me urgent emails"
         elif action_type == "show_tasks":
-            action_items = loop.run_until_complete(backend.get_all_action_items())
+            action_items = run_async(backend.get_all_action_items())
             response = format_action_items(action_items)
             user_message = "Show me all tasks"
         else:
             response = "Unknown action"
             user_message = action_type
-        
-        loop.close()
-        
+
         # Add to chat history
         st.session_state.chat_history.append({
+            'id': str(uuid4()),
             'role': 'user',
             'content': user_message
         })
-        
+
         st.session_state.chat_history.append({
+            'id': str(uuid4()),
             'role': 'agent',
             'content': response,
             'sources': []
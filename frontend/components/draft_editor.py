@@ -1,32 +1,74 @@
 """Draft editor component."""
-import streamlit as st
-import json
 import asyncio
+import orjson
+import streamlit as st
 from typing import Optional
 
 from backend.models.draft import EmailDraft
+from frontend.runtime import iter_async, run_async, submit_async
+
+
+async def _load_editor_data(backend, email_id: Optional[str]):
+    """Fetch the saved drafts and the reply target concurrently.
+
+    Both tabs render on every rerun, so issuing the two independent
+    fetches together costs max of the round-trips instead of their sum.
+    """
+
+    async def _reply_email():
+        return await backend.get_email_by_id(email_id) if email_id else None
+
+    return await asyncio.gather(backend.get_all_drafts(), _reply_email())
+
+
+@st.cache_data(show_spinner=False)
+def _cached_editor_data(_backend, email_id: Optional[str], version: int):
+    """Editor fetches memoized on the drafts version token.
+
+    Every widget interaction reruns the script; the token only moves when
+    a draft is written or deleted, so steady-state reruns skip the DB
+    round-trips entirely.
+    """
+    return run_async(_load_editor_data(_backend, email_id))
+
+
+def _bump_drafts_version():
+    """Invalidate the cached editor data after a draft write."""
+    st.session_state["drafts_version"] = (
+        st.session_state.get("drafts_version", 0) + 1
+    )
 
 
 def render_draft_editor(backend, email_id: Optional[str] = None):
     """Render draft editor interface."""
-    
+
     st.subheader("✉️ Draft Email")
-    
+
+    try:
+        drafts, reply_email = _cached_editor_data(
+            backend,
+            email_id,
+            st.session_state.get("drafts_version", 0)
+        )
+    except Exception as e:
+        st.error(f"Error loading drafts: {str(e)}")
+        drafts, reply_email = [], None
+
     # Tabs for different draft modes
     tab1, tab2, tab3 = st.tabs([
         "📝 New Draft",
         "↩️ Reply Draft",
         "💾 Saved Drafts"
     ])
-    
+
     with tab1:
         render_new_draft_editor(backend)
-    
+
     with tab2:
-        render_reply_draft_editor(backend, email_id)
-    
+        render_reply_draft_editor(backend, email_id, reply_email)
+
     with tab3:
-        render_saved_drafts(backend)
+        render_saved_drafts(backend, drafts)
 
 
 def render_new_draft_editor(backend):
@@ -88,22 +130,16 @@ def render_new_draft_editor(backend):
         display_draft(st.session_state.current_draft, backend, key_prefix="new")
 
 
-def render_reply_draft_editor(backend, email_id: Optional[str] = None):
+def render_reply_draft_editor(backend, email_id: Optional[str] = None, email=None):
     """Render reply draft interface."""
-    
+
     st.markdown("### Generate Reply Draft")
-    
+
     # Email selection
     if not email_id:
         st.info("Select an email from the inbox to generate a reply.")
         return
-    
-    # Get email details
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    email = loop.run_until_complete(backend.get_email_by_id(email_id))
-    loop.close()
-    
+
     if not email:
         st.error("Email not found.")
         return
@@ -130,26 +166,17 @@ def render_reply_draft_editor(backend, email_id: Optional[str] = None):
         display_draft(st.session_state.current_draft, backend, key_prefix="reply")
 
 
-def render_saved_drafts(backend):
+def render_saved_drafts(backend, drafts):
     """Render saved drafts list."""
-    
+
     st.markdown("### Saved Drafts")
-    
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        drafts = loop.run_until_complete(backend.get_all_drafts())
-        loop.close()
-        
-        if not drafts:
-            st.info("No saved drafts.")
-            return
-        
-        for draft in drafts:
-            render_saved_draft_card(draft, backend)
-            
-    except Exception as e:
-        st.error(f"Error loading drafts: {str(e)}")
+
+    if not drafts:
+        st.info("No saved drafts.")
+        return
+
+    for draft in drafts:
+        render_saved_draft_card(draft, backend)
 
 
 def render_saved_draft_card(draft: EmailDraft, backend):
@@ -185,82 +212,130 @@ def render_saved_draft_card(draft: EmailDraft, backend):
                 delete_draft(backend, draft.id)
 
 
+def _refine_callback(backend, draft_id: str, key_prefix: str):
+    """Submit callback: refine using the refinement text in session state."""
+    refinement = st.session_state.get(f"{key_prefix}_draft_refinement", "")
+    if refinement:
+        refine_draft(backend, draft_id, refinement)
+
+
+def _save_callback(backend, draft: EmailDraft, key_prefix: str):
+    """Submit callback: save the edited subject/body from session state."""
+    save_draft_edits(
+        backend,
+        draft,
+        st.session_state[f"{key_prefix}_draft_subject_edit"],
+        st.session_state[f"{key_prefix}_draft_body_edit"]
+    )
+
+
+def _discard_callback():
+    """Submit callback: drop the in-progress draft."""
+    st.session_state.pop("current_draft", None)
+
+
 def display_draft(draft: EmailDraft, backend, key_prefix: str = "default"):
     """Display generated draft with editing options."""
     
     st.markdown("---")
     st.markdown("### Generated Draft")
-    
-    # Editable fields
-    subject = st.text_input(
-        "Subject:",
-        value=draft.subject,
-        key=f"{key_prefix}_draft_subject_edit"
-    )
-    
-    body = st.text_area(
-        "Body:",
-        value=draft.body,
-        height=300,
-        key=f"{key_prefix}_draft_body_edit"
-    )
-    
-    # Refinement
-    refinement = st.text_input(
-        "Refine draft (optional):",
-        placeholder="E.g., Make it more formal, add a closing paragraph...",
-        key=f"{key_prefix}_draft_refinement"
-    )
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        if st.button("🔄 Refine", use_container_width=True, key=f"{key_prefix}_refine_btn"):
-            if refinement:
-                refine_draft(backend, draft.id, refinement)
-    
-    with col2:
-        if st.button("💾 Save", use_container_width=True, key=f"{key_prefix}_save_btn"):
-            save_draft_edits(backend, draft, subject, body)
-    
-    with col3:
-        if st.button("📤 Export", use_container_width=True, key=f"{key_prefix}_export_btn"):
-            export_draft_json(draft)
-    
-    with col4:
-        if st.button("🗑️ Discard", use_container_width=True, key=f"{key_prefix}_discard_btn"):
-            if 'current_draft' in st.session_state:
-                del st.session_state.current_draft
-            st.rerun()
+
+    # Forms batch widget state client-side: typing in the fields no
+    # longer reruns the script — only a submit button does
+    with st.form(f"{key_prefix}_draft_form"):
+        st.text_input(
+            "Subject:",
+            value=draft.subject,
+            key=f"{key_prefix}_draft_subject_edit"
+        )
+
+        st.text_area(
+            "Body:",
+            value=draft.body,
+            height=300,
+            key=f"{key_prefix}_draft_body_edit"
+        )
+
+        # Refinement
+        st.text_input(
+            "Refine draft (optional):",
+            placeholder="E.g., Make it more formal, add a closing paragraph...",
+            key=f"{key_prefix}_draft_refinement"
+        )
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        # on_click callbacks read the widget values from session state
+        # and Streamlit reruns once when they return — no explicit
+        # st.rerun() needed
+        with col1:
+            st.form_submit_button(
+                "🔄 Refine",
+                use_container_width=True,
+                on_click=_refine_callback,
+                args=(backend, draft.id, key_prefix)
+            )
+        with col2:
+            st.form_submit_button(
+                "💾 Save",
+                use_container_width=True,
+                on_click=_save_callback,
+                args=(backend, draft, key_prefix)
+            )
+        with col3:
+            export_clicked = st.form_submit_button(
+                "📤 Export", use_container_width=True
+            )
+        with col4:
+            st.form_submit_button(
+                "🗑️ Discard",
+                use_container_width=True,
+                on_click=_discard_callback
+            )
+
+    # Export dispatches outside the form block — it renders a download
+    # button, which is not allowed inside a form
+    if export_clicked:
+        export_draft_json(draft)
     
     # Show metadata
     if draft.suggested_followups:
         with st.expander("💡 Suggested Follow-ups"):
-            for followup in draft.suggested_followups:
-                st.markdown(f"- {followup}")
+            # One markdown element for the whole list
+            st.markdown("\n".join(
+                f"- {followup}" for followup in draft.suggested_followups
+            ))
 
 
 def generate_new_draft(backend, recipient: str, subject: str, instructions: str, context: Optional[str]):
-    """Generate new draft."""
+    """Generate new draft, streaming the body into the page as it arrives."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        draft = loop.run_until_complete(
-            backend.generate_new_draft(
+        placeholder = st.empty()
+        buf = []
+        draft = None
+
+        # The stream yields body chunks, then the persisted draft last;
+        # rendering per chunk makes perceived latency time-to-first-token
+        for item in iter_async(
+            backend.astream_new_draft(
                 recipient=recipient,
                 subject=subject,
                 instructions=instructions,
                 context=context
             )
-        )
-        
-        loop.close()
-        
+        ):
+            if isinstance(item, EmailDraft):
+                draft = item
+            else:
+                buf.append(item)
+                placeholder.markdown("".join(buf))
+
+        placeholder.empty()
         st.session_state.current_draft = draft
+        _bump_drafts_version()
         st.success("✅ Draft generated successfully!")
         st.rerun()
-        
+
     except Exception as e:
         st.error(f"❌ Error generating draft: {str(e)}")
 
@@ -268,19 +343,15 @@ def generate_new_draft(backend, recipient: str, subject: str, instructions: str,
 def generate_reply_draft(backend, email_id: str, additional_context: Optional[str]):
     """Generate reply draft."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        draft = loop.run_until_complete(
+        draft = run_async(
             backend.generate_reply_draft(
                 email_id=email_id,
                 additional_context=additional_context
             )
         )
-        
-        loop.close()
-        
+
         st.session_state.current_draft = draft
+        _bump_drafts_version()
         st.success("✅ Reply draft generated successfully!")
         st.rerun()
         
@@ -291,36 +362,39 @@ def generate_reply_draft(backend, email_id: str, additional_context: Optional[st
 def refine_draft(backend, draft_id: str, refinement_instruction: str):
     """Refine existing draft."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        draft = loop.run_until_complete(
-            backend.refine_draft(draft_id, refinement_instruction)
-        )
-        
-        loop.close()
-        
+        draft = run_async(backend.refine_draft(draft_id, refinement_instruction))
+
         st.session_state.current_draft = draft
+        _bump_drafts_version()
         st.success("✅ Draft refined successfully!")
-        st.rerun()
-        
+
     except Exception as e:
         st.error(f"❌ Error refining draft: {str(e)}")
 
 
 def save_draft_edits(backend, draft: EmailDraft, subject: str, body: str):
-    """Save manual edits to draft."""
+    """Save manual edits to draft, writing only the changed fields."""
     try:
-        draft.subject = subject
-        draft.body = body
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(backend.db_service.save_draft(draft))
-        loop.close()
-        
-        st.success("✅ Draft saved successfully!")
-        
+        changes = {}
+        if subject != draft.subject:
+            changes["subject"] = subject
+        if body != draft.body:
+            changes["body"] = body
+
+        if not changes:
+            st.info("No changes to save.")
+            return
+
+        # Fire-and-forget: the write completes on the background loop
+        # while the session state is updated optimistically
+        submit_async(backend.db_service.update_draft_fields(draft.id, **changes))
+
+        for field, value in changes.items():
+            setattr(draft, field, value)
+
+        _bump_drafts_version()
+        st.success("💾 Draft saved!")
+
     except Exception as e:
         st.error(f"❌ Error saving draft: {str(e)}")
 
@@ -328,11 +402,9 @@ def save_draft_edits(backend, draft: EmailDraft, subject: str, body: str):
 def delete_draft(backend, draft_id: str):
     """Delete draft."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(backend.delete_draft(draft_id))
-        loop.close()
-        
+        run_async(backend.delete_draft(draft_id))
+
+        _bump_drafts_version()
         st.success("✅ Draft deleted!")
         st.rerun()
         
@@ -340,14 +412,31 @@ def delete_draft(backend, draft_id: str):
         st.error(f"❌ Error deleting draft: {str(e)}")
 
 
+# Serialized exports keyed by (id, updated_at): re-clicking export for
+# an unchanged draft reuses the bytes instead of re-dumping the model
+_export_cache = {}
+
+
+def _draft_export_bytes(draft: EmailDraft) -> bytes:
+    """Serialize a draft for export, memoized until the draft changes."""
+    key = (draft.id, draft.updated_at)
+    cached = _export_cache.get(key)
+    if cached is None:
+        cached = orjson.dumps(
+            draft.to_json_metadata(),
+            option=orjson.OPT_INDENT_2
+        )
+        if len(_export_cache) >= 64:
+            _export_cache.pop(next(iter(_export_cache)))
+        _export_cache[key] = cached
+    return cached
+
+
 def export_draft_json(draft: EmailDraft):
     """Export draft as JSON."""
-    json_data = draft.to_json_metadata()
-    json_str = json.dumps(json_data, indent=2)
-    
     st.download_button(
         label="⬇️ Download JSON",
-        data=json_str,
+        data=_draft_export_bytes(draft),
         file_name=f"draft_{draft.id}.json",
         mime="application/json"
     )
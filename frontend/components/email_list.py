@@ -1,10 +1,86 @@
 """Email list component for Streamlit."""
+import html as html_lib
+
+import numpy as np
 import streamlit as st
 from typing import List, Optional
 from datetime import datetime
 
 from backend.models.email import Email, EmailCategory
 
+# Cards rendered per page; everything off-page stays out of the
+# component tree entirely
+_PAGE_SIZE = 50
+
+# Display icon lookups, built once at import instead of per render
+_CATEGORY_ICON = {
+    EmailCategory.URGENT: "🔴",
+    EmailCategory.ACTION_REQUIRED: "🟡",
+    EmailCategory.INFORMATIONAL: "🔵",
+    EmailCategory.SPAM: "⚫",
+    EmailCategory.UNCATEGORIZED: "⚪"
+}
+
+_PRIORITY_ICON = {
+    "High": "🔴",
+    "Medium": "🟡",
+    "Low": "🟢"
+}
+
+# Category display order (lower = higher priority), built once at import
+_CAT_PRIORITY = {
+    EmailCategory.URGENT: 1,
+    EmailCategory.ACTION_REQUIRED: 2,
+    EmailCategory.INFORMATIONAL: 3,
+    EmailCategory.UNCATEGORIZED: 4,
+    EmailCategory.SPAM: 5
+}
+
+
+@st.cache_data(show_spinner=False)
+def _visible_order(
+    _emails: List[Email],
+    version: int,
+    filter_category: str,
+    sort_order: str
+) -> List[int]:
+    """Resolve the filtered, sorted display order as index positions.
+
+    One pass builds the column arrays and numpy does the mask and the
+    argsort/lexsort in C; the result is memoized per (version, filter,
+    sort) so steady-state reruns reuse the order without touching the
+    list at all. The version token moves when the inbox is (re)loaded.
+    """
+    count = len(_emails)
+    ts = np.fromiter(
+        (e.timestamp.timestamp() for e in _emails),
+        dtype=np.float64,
+        count=count
+    )
+    if filter_category != "All":
+        idx = np.flatnonzero(np.fromiter(
+            (e.category.value == filter_category for e in _emails),
+            dtype=bool,
+            count=count
+        ))
+    else:
+        idx = np.arange(count)
+
+    if sort_order == "Category":
+        # Priority ASC, newest first within each category
+        prio = np.fromiter(
+            (_CAT_PRIORITY.get(e.category, 99) for e in _emails),
+            dtype=np.int64,
+            count=count
+        )
+        order = np.lexsort((-ts[idx], prio[idx]))
+    elif sort_order == "Newest":
+        order = np.argsort(-ts[idx], kind="stable")
+    else:
+        order = np.argsort(ts[idx], kind="stable")
+
+    return idx[order].tolist()
+
 
 def render_email_list(
     emails: List[Email],
@@ -34,143 +110,113 @@ def render_email_list(
             key="email_list_sort"
         )
     
-    # Filter emails
-    filtered_emails = emails
-    if filter_category != "All":
-        filtered_emails = [
-            e for e in emails
-            if e.category.value == filter_category
-        ]
-    
-    # Sort emails
-    if sort_order == "Category":
-        # Define priority (lower number = higher priority)
-        category_priority = {
-            EmailCategory.URGENT: 1,
-            EmailCategory.ACTION_REQUIRED: 2,
-            EmailCategory.INFORMATIONAL: 3,
-            EmailCategory.UNCATEGORIZED: 4,
-            EmailCategory.SPAM: 5
-        }
-        
-        filtered_emails = sorted(
-            filtered_emails,
-            key=lambda x: (category_priority.get(x.category, 99), x.timestamp),
-            reverse=False # We want 1 -> 5, but for timestamp we might want newest first?
-                          # Actually, let's keep it simple: Priority ASC, then Timestamp DESC (Newest first within category)
-        )
-        # To achieve Priority ASC and Timestamp DESC, we can use a tuple key with negated timestamp
-        filtered_emails = sorted(
-            filtered_emails,
-            key=lambda x: (category_priority.get(x.category, 99), -x.timestamp.timestamp())
-        )
-    else:
-        filtered_emails = sorted(
-            filtered_emails,
-            key=lambda x: x.timestamp,
-            reverse=(sort_order == "Newest")
-        )
-    
+    # Filter and sort in one cached pass
+    order = _visible_order(
+        emails,
+        st.session_state.get("emails_version", 0),
+        filter_category,
+        sort_order
+    )
+
     st.markdown("---")
-    
-    # Display emails
-    for email in filtered_emails:
-        render_email_card(
-            email,
-            is_selected=(email.id == selected_email_id),
-            on_select=on_select_callback
+
+    # Page-slice the order so only ~_PAGE_SIZE cards ever materialize,
+    # no matter how large the inbox grows
+    total_pages = max(1, -(-len(order) // _PAGE_SIZE))
+    page = min(st.session_state.get("email_page", 0), total_pages - 1)
+    start = page * _PAGE_SIZE
+
+    # One markdown element carries every card; per-card widgets would
+    # each cost a websocket message and a component-tree entry
+    visible = [emails[i] for i in order[start:start + _PAGE_SIZE]]
+    st.markdown(
+        "".join(
+            _card_html(email, email.id == selected_email_id)
+            for email in visible
+        ),
+        unsafe_allow_html=True
+    )
+
+    if visible:
+        ids = [email.id for email in visible]
+        labels = {
+            email.id: (
+                f"{_category_icon(email)} {email.sender}: {email.subject}"
+            )
+            for email in visible
+        }
+        choice = st.radio(
+            "Open email",
+            options=ids,
+            index=ids.index(selected_email_id) if selected_email_id in labels else None,
+            format_func=labels.get,
+            label_visibility="collapsed",
+            key="email_select_radio"
         )
+        if choice and choice != selected_email_id and on_select_callback:
+            on_select_callback(choice)
+            st.rerun()
 
+    if total_pages > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("⬅️ Prev", disabled=page == 0, key="email_page_prev"):
+                st.session_state.email_page = page - 1
+                st.rerun()
+        with col_page:
+            st.caption(f"Page {page + 1} of {total_pages}")
+        with col_next:
+            if st.button(
+                "Next ➡️",
+                disabled=page >= total_pages - 1,
+                key="email_page_next"
+            ):
+                st.session_state.email_page = page + 1
+                st.rerun()
 
-def render_email_card(
-    email: Email,
-    is_selected: bool = False,
-    on_select=None
-):
-    """Render individual email card."""
-    
-    # Category color mapping
-    category_colors = {
-        EmailCategory.URGENT: "🔴",
-        EmailCategory.ACTION_REQUIRED: "🟡",
-        EmailCategory.INFORMATIONAL: "🔵",
-        EmailCategory.SPAM: "⚫",
-        EmailCategory.UNCATEGORIZED: "⚪"
-    }
-    
-    category_icon = category_colors.get(email.category, "⚪")
-    
-    # Card container
-    card_style = """
-    <style>
-    .email-card {
-        padding: 15px;
-        border-radius: 8px;
-        border: 1px solid #ddd;
-        margin-bottom: 10px;
-        background-color: #f9f9f9;
-        cursor: pointer;
-        transition: all 0.2s;
-    }
-    .email-card:hover {
-        background-color: #f0f0f0;
-        border-color: #1f77b4;
-    }
-    .email-card.selected {
-        background-color: #e6f3ff;
-        border-color: #1f77b4;
-        border-width: 2px;
-    }
-    .email-sender {
-        font-weight: bold;
-        color: #333;
-    }
-    .email-subject {
-        font-size: 14px;
-        color: #555;
-        margin: 5px 0;
-    }
-    .email-meta {
-        font-size: 12px;
-        color: #888;
-    }
-    .email-preview {
-        font-size: 12px;
-        color: #666;
-        font-style: italic;
-        margin-top: 5px;
-    }
-    </style>
+
+def _category_icon(email: Email) -> str:
+    """Icon shown next to the sender for the email's category."""
+    return _CATEGORY_ICON.get(email.category, "⚪")
+
+
+def _card_html(email: Email, is_selected: bool) -> str:
+    """Build one email card as an HTML fragment.
+
+    Styling comes from styles/custom.css, which app.py injects once per
+    run. Content is escaped since the blob renders with HTML enabled.
     """
-    
-    st.markdown(card_style, unsafe_allow_html=True)
-    
-    with st.container():
-        col1, col2 = st.columns([0.9, 0.1])
-        
-        with col1:
-            # Email header
-            st.markdown(f"**{category_icon} {email.sender}**")
-            st.markdown(f"*{email.subject}*")
-            
-            # Metadata
-            timestamp_str = email.timestamp.strftime("%b %d, %Y %I:%M %p")
-            st.caption(f"📅 {timestamp_str} | 🏷️ {email.category.value}")
-            
-            # Action items badge
-            if email.action_items:
-                st.caption(f"✅ {len(email.action_items)} action item(s)")
-            
-            # Preview
-            preview = email.body[:100] + "..." if len(email.body) > 100 else email.body
-            st.caption(f"💬 {preview}")
-        
-        with col2:
-            if st.button("📖", key=f"select_{email.id}", help="View email"):
-                if on_select:
-                    on_select(email.id)
-        
-        st.markdown("---")
+    selected = " selected" if is_selected else ""
+    badge = (
+        f" | ✅ {len(email.action_items)} action item(s)"
+        if email.action_items else ""
+    )
+    return (
+        f'<div class="email-card{selected}">'
+        f'<div class="email-sender">{_category_icon(email)} '
+        f'{html_lib.escape(email.sender)}</div>'
+        f'<div class="email-subject"><em>{html_lib.escape(email.subject)}</em></div>'
+        f'<div class="email-meta">📅 {email.formatted_timestamp} | '
+        f'🏷️ {email.category.value}{badge}</div>'
+        f'<div class="email-preview">💬 {html_lib.escape(email.preview)}</div>'
+        f'</div>'
+    )
+
+
+def _build_action_table(items) -> str:
+    """Build the action-item markdown table in one join.
+
+    A single string build keeps the cost per item at one f-string and
+    two dict lookups, however large the bulk-categorized item list gets.
+    """
+    rows = "\n".join(
+        f"| {'✅' if item.completed else '⬜'} "
+        f"{item.description} "
+        f"| {_PRIORITY_ICON.get(item.priority, '⚪')} {item.priority} "
+        f"| {f'📅 {item.deadline}' if item.deadline else '—'} |"
+        for item in items
+    )
+    return f"| Task | Priority | Deadline |\n|---|---|---|\n{rows}"
 
 
 def render_email_details(email: Email):
@@ -207,24 +253,11 @@ def render_email_details(email: Email):
         with st.expander("📊 Categorization Details"):
             st.info(f"**Reason:** {email.category_reason}")
     
-    # Action items
+    # Action items — one markdown table instead of a columns layout
+    # per item
     if email.action_items:
         with st.expander(f"✅ Action Items ({len(email.action_items)})"):
-            for idx, item in enumerate(email.action_items, 1):
-                col1, col2, col3 = st.columns([3, 1, 1])
-                with col1:
-                    status = "✅" if item.completed else "⬜"
-                    st.markdown(f"{status} {item.description}")
-                with col2:
-                    priority_colors = {
-                        "High": "🔴",
-                        "Medium": "🟡",
-                        "Low": "🟢"
-                    }
-                    st.caption(f"{priority_colors.get(item.priority, '⚪')} {item.priority}")
-                with col3:
-                    if item.deadline:
-                        st.caption(f"📅 {item.deadline}")
+            st.markdown(_build_action_table(email.action_items))
     
     # Attachments
     if email.has_attachments:
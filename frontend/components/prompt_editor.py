@@ -4,6 +4,7 @@ from datetime import datetime
 
 from backend.models.prompt import PromptConfig
 from backend.config.settings import settings
+from frontend.runtime import submit_async
 
 
 def render_prompt_editor(backend):
@@ -80,50 +81,58 @@ def render_prompt_section(
         else default_prompt
     )
     
-    # Text area for editing
-    new_prompt_text = st.text_area(
-        f"Edit {prompt_name}",
-        value=current_text,
-        height=200,
-        key=f"prompt_editor_{prompt_type}",
-        label_visibility="collapsed"
-    )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button(
-            f"💾 Save {prompt_name}",
-            key=f"save_prompt_{prompt_type}",
-            use_container_width=True
-        ):
-            save_prompt(
-                backend,
-                prompt_type=prompt_type,
-                prompt_name=prompt_name,
-                prompt_text=new_prompt_text
+    # The form batches edits client-side: typing in a 200-line prompt
+    # no longer reruns all three tabs on every keystroke
+    with st.form(f"pf_{prompt_type}"):
+        new_prompt_text = st.text_area(
+            f"Edit {prompt_name}",
+            value=current_text,
+            height=200,
+            key=f"prompt_editor_{prompt_type}",
+            label_visibility="collapsed"
+        )
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            save_clicked = st.form_submit_button(
+                f"💾 Save {prompt_name}",
+                use_container_width=True
             )
-    
-    with col2:
-        if st.button(
-            "🔄 Reset to Default",
-            key=f"reset_prompt_{prompt_type}",
-            use_container_width=True
-        ):
-            st.session_state[f"prompt_editor_{prompt_type}"] = default_prompt
-            st.rerun()
-    
+
+        with col2:
+            # The callback runs before the widget frame is rebuilt, so
+            # it may overwrite the text area's state directly
+            st.form_submit_button(
+                "🔄 Reset to Default",
+                use_container_width=True,
+                on_click=_reset_prompt,
+                args=(prompt_type, default_prompt)
+            )
+
+    if save_clicked:
+        save_prompt(
+            backend,
+            prompt_type=prompt_type,
+            prompt_name=prompt_name,
+            prompt_text=new_prompt_text
+        )
+
+
     # Show prompt history
     with st.expander("📜 Prompt History"):
         st.caption("Previous versions of this prompt will appear here.")
         # TODO: Implement prompt version history
 
 
+def _reset_prompt(prompt_type: str, default_prompt: str):
+    """Submit callback: restore a prompt text area to its default."""
+    st.session_state[f"prompt_editor_{prompt_type}"] = default_prompt
+
+
 def save_prompt(backend, prompt_type: str, prompt_name: str, prompt_text: str):
     """Save prompt configuration."""
     try:
-        import asyncio
-        
         # Create prompt config
         prompt_config = PromptConfig(
             name=prompt_name,
@@ -131,35 +140,18 @@ def save_prompt(backend, prompt_type: str, prompt_name: str, prompt_text: str):
             prompt_text=prompt_text,
             is_active=True
         )
-        
-        # Save using backend
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        prompt_id = loop.run_until_complete(
-            backend.save_prompt_config(prompt_config)
+
+        # Fire-and-forget: the write completes on the background loop
+        # while session state reflects the new prompt optimistically —
+        # re-reading from the DB here would both block and race the write
+        submit_async(backend.save_prompt_config(prompt_config))
+
+        st.session_state.setdefault('active_prompts', {})[prompt_type] = (
+            prompt_config
         )
-        loop.close()
-        
-        st.success(f"✅ {prompt_name} saved successfully!")
-        
-        # Refresh active prompts in session state
-        refresh_active_prompts(backend)
-        
-    except Exception as e:
-        st.error(f"❌ Error saving prompt: {str(e)}")
+
+        st.success(f"💾 {prompt_name} saved!")
 
 
-def refresh_active_prompts(backend):
-    """Refresh active prompts in session state."""
-    try:
-        import asyncio
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        active_prompts = loop.run_until_complete(backend.get_active_prompts())
-        loop.close()
-        
-        st.session_state['active_prompts'] = active_prompts
-        
     except Exception as e:
-        st.error(f"Error refreshing prompts: {str(e)}")
+        st.error(f"❌ Error saving prompt: {str(e)}")
@@ -0,0 +1,76 @@
+"""Shared asyncio runtime for the Streamlit frontend."""
+import asyncio
+import logging
+import threading
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# uvloop's libuv-based loop lowers per-await overhead on the I/O-bound
+# backend calls; it is optional and unavailable on Windows, so fall back
+# to the stock selector loop silently
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use.
+
+    Streamlit reruns the script on every interaction; spinning up a fresh
+    event loop per call tears down connection pools, semaphores and pending
+    batches each time. One loop on a daemon thread keeps those resources
+    alive for the life of the process.
+    """
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    thread = threading.Thread(
+        target=loop.run_forever,
+        name="frontend-asyncio",
+        daemon=True
+    )
+    thread.start()
+    return loop
+
+
+def run_async(coro):
+    """Run a coroutine on the shared loop and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+def submit_async(coro):
+    """Fire-and-forget a coroutine on the shared loop.
+
+    Returns the concurrent future without blocking on it. Failures are
+    logged from the done callback; the callback runs on the loop thread,
+    which has no script run context, so it must not touch Streamlit
+    state.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+    def _log_failure(f):
+        exc = f.exception()
+        if exc is not None:
+            logger.error(f"Background task failed: {exc}")
+
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def iter_async(aiter):
+    """Drive an async iterator from the script thread, item by item.
+
+    Each item is awaited on the shared loop but delivered on the calling
+    thread, so Streamlit elements (which must be touched from the script
+    thread) can render incrementally while the stream is in flight.
+    """
+    loop = get_event_loop()
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(
+                aiter.__anext__(), loop
+            ).result()
+        except StopAsyncIteration:
+            return
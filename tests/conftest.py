@@ -0,0 +1,136 @@
+"""Shared fixtures for the test suite."""
+import pytest
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from backend.agents.categorization_agent import CategorizationAgent
+from backend.agents.action_item_agent import ActionItemAgent
+from backend.agents.draft_agent import DraftAgent
+from backend.agents.email_analysis_agent import EmailAnalysisAgent
+from backend.agents.rag_agent import RAGAgent
+from backend.models.email import Email
+from backend.services.llm_service import LLMService
+from backend.services.email_service import EmailService
+
+from backend.services.vector_service import VectorService
+
+
+def async_return(value):
+    """Build a plain coroutine stub that returns value.
+
+    Cheaper than AsyncMock at every await — no call recording or spec
+    introspection — for patches where the test only cares about the
+    return value, never the calls.
+    """
+    async def _stub(*args, **kwargs):
+        return value
+    return _stub
+
+
+@contextmanager
+def mock_services(service, **overrides):
+    """Batch-patch outbound methods across a service's collaborators.
+
+    Each keyword names a method on the service itself or on one of its
+    llm_service/db_service/vector_service attributes; the value becomes
+    an async_return stub. One ExitStack push/pop replaces a nested
+    patch.object block per method.
+    """
+    targets = [service] + [
+        getattr(service, attr)
+        for attr in ("llm_service", "db_service", "vector_service")
+        if hasattr(service, attr)
+    ]
+    with ExitStack() as stack:
+        for name, value in overrides.items():
+            owner = next(t for t in targets if hasattr(t, name))
+            stack.enter_context(
+                patch.object(owner, name, new=async_return(value))
+            )
+        yield
+
+
+@pytest.fixture(autouse=True, scope="session")
+def stub_external_clients():
+    """Stub the Pinecone SDK for the whole session.
+
+    VectorService.__init__ otherwise opens a real connection and lists
+    indexes, so constructing EmailService or RAGAgent needs network
+    access. Every test mocks the vector boundary anyway; a Mock client
+    makes construction a cheap attribute assignment and lets the suite
+    run offline.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("backend.services.vector_service.Pinecone", Mock())
+        mp.setattr(VectorService, "_ensure_index_exists", lambda self: None)
+        yield
+
+
+# The agent/service fixtures are session-scoped: construction is the
+# expensive part (SDK clients, config reads), while the tests themselves
+# only patch outbound methods, which patch.object restores per test.
+
+
+@pytest.fixture(scope="session")
+def llm_service():
+    """Create LLM service instance."""
+    return LLMService()
+
+
+@pytest.fixture(scope="session")
+def email_service():
+    """Create email service instance."""
+    return EmailService()
+
+
+@pytest.fixture(scope="session")
+def categorization_agent():
+    """Create categorization agent instance."""
+    return CategorizationAgent()
+
+
+@pytest.fixture(scope="session")
+def action_item_agent():
+    """Create action item agent instance."""
+    return ActionItemAgent()
+
+
+@pytest.fixture(scope="session")
+def draft_agent():
+    """Create draft agent instance."""
+    return DraftAgent()
+
+
+@pytest.fixture(scope="session")
+def email_analysis_agent():
+    """Create email analysis agent instance."""
+    return EmailAnalysisAgent()
+
+
+@pytest.fixture(scope="session")
+def rag_agent():
+    """Create RAG agent instance."""
+    return RAGAgent()
+
+
+# Validated once at import; tests receive copies, so per-test cost is a
+# shallow model_copy rather than a full Pydantic validation pass
+SAMPLE_EMAIL = Email(
+    id="test_001",
+    sender="test@example.com",
+    recipient="user@company.com",
+    subject="Test Subject",
+    body="This is a test email body with some content.",
+    timestamp=datetime.now()
+)
+
+
+@pytest.fixture
+def sample_email():
+    """Copy of SAMPLE_EMAIL (function-scoped: agent tests mutate it).
+
+    Tests only rebind attributes (category, action_items), never mutate
+    shared containers in place, so a shallow copy isolates them.
+    """
+    return SAMPLE_EMAIL.model_copy()
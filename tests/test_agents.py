@@ -1,235 +1,319 @@
 """Tests for agent modules."""
 import pytest
 import asyncio
-from unittest.mock import Mock, AsyncMock, patch
-from datetime import datetime
-
-from backend.agents.categorization_agent import CategorizationAgent
-from backend.agents.action_item_agent import ActionItemAgent
-from backend.agents.draft_agent import DraftAgent
-from backend.agents.rag_agent import RAGAgent
-from backend.models.email import Email, EmailCategory, ActionItem
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from backend.models.email import EmailCategory, ActionItem
 from backend.models.draft import EmailDraft
+from backend.services.llm_service import LLMService
+from backend.services.database_service import DatabaseService
+from backend.services.vector_service import VectorService
+from backend.utils.background import flush_pending_writes
+from conftest import SAMPLE_EMAIL
+
+# Outbound methods replaced for every agent test, grouped by the class
+# they live on
+_LLM_METHODS = (
+    "categorize_email", "extract_action_items", "draft_reply",
+    "generate_text", "answer_question", "analyze_email"
+)
+_DB_METHODS = (
+    "save_email", "save_draft", "complete_action_item",
+    "category_counts", "get_all_emails"
+)
+_VECTOR_METHODS = ("query_with_sources",)
+
+
+@pytest.fixture(autouse=True)
+def mock_io(monkeypatch):
+    """Patch every outbound service boundary once per test.
+
+    Class-level AsyncMock sentinels replace the nested per-test
+    patch.object stacks; tests configure .return_value on the mock they
+    exercise, and monkeypatch restores the real methods on teardown.
+    """
+    mocks = SimpleNamespace()
+    for cls, names in (
+        (LLMService, _LLM_METHODS),
+        (DatabaseService, _DB_METHODS),
+        (VectorService, _VECTOR_METHODS)
+    ):
+        for name in names:
+            mock = AsyncMock()
+            setattr(mocks, name, mock)
+            monkeypatch.setattr(cls, name, mock)
+    return mocks
+
+
+def _check_categorize(result, sample_email):
+    assert result.category == EmailCategory.ACTION_REQUIRED
+    assert result.category_reason == "Test reason"
+
+
+def _check_action_items(result, sample_email):
+    assert len(result.action_items) == 1
+    assert result.action_items[0].description == "Test task"
+    assert result.action_items[0].priority == "High"
+
+
+def _check_reply_draft(result, sample_email):
+    assert isinstance(result, EmailDraft)
+    assert result.subject.startswith("Re:")
+    assert result.recipient == sample_email.sender
+    assert result.body == "This is a test reply."
+
+
+def _check_new_draft(result, sample_email):
+    assert isinstance(result, EmailDraft)
+    assert result.recipient == "test@example.com"
+    assert result.subject == "Test Subject"
 
 
-@pytest.fixture
-def sample_email():
-    """Create sample email for testing."""
-    return Email(
-        id="test_001",
-        sender="test@example.com",
-        recipient="user@company.com",
-        subject="Test Subject",
-        body="This is a test email body with some content.",
-        timestamp=datetime.now()
+# (fixture name, mock_io return values, entry point, result check) —
+# the four mock-and-assert agent tests share one parametrized body
+_ENTRYPOINT_CASES = [
+    pytest.param(
+        "categorization_agent",
+        {
+            "categorize_email": {
+                "category": "ACTION_REQUIRED",
+                "reason": "Test reason"
+            },
+            "save_email": "test_001"
+        },
+        lambda agent, email: agent.categorize_single_email(email),
+        _check_categorize,
+        id="categorize_single_email"
+    ),
+    pytest.param(
+        "action_item_agent",
+        {
+            "extract_action_items": [
+                {"description": "Test task", "priority": "High", "deadline": None}
+            ],
+            "save_email": "test_001"
+        },
+        lambda agent, email: agent.extract_action_items(email),
+        _check_action_items,
+        id="extract_action_items"
+    ),
+    pytest.param(
+        "draft_agent",
+        {
+            "draft_reply": "This is a test reply.",
+            # _generate_followups parses this through the real code path
+            "generate_text": "- Follow up 1\n- Follow up 2",
+            "save_draft": "draft_001"
+        },
+        lambda agent, email: agent.generate_reply_draft(email),
+        _check_reply_draft,
+        id="generate_reply_draft"
+    ),
+    pytest.param(
+        "draft_agent",
+        {
+            "generate_text": "This is a new draft.",
+            "save_draft": "draft_002"
+        },
+        lambda agent, email: agent.generate_new_draft(
+            recipient="test@example.com",
+            subject="Test Subject",
+            instructions="Write a professional email"
+        ),
+        _check_new_draft,
+        id="generate_new_draft"
+    ),
+]
+
+
+@pytest.mark.slow
+class TestAgentEntrypoints:
+    """Parametrized mock-and-assert coverage of the agent entry points.
+
+    Marked slow: the batch test below covers the same scenarios in one
+    loop run, so the fast path (make test-fast) skips these.
+    """
+
+    @pytest.mark.parametrize(
+        "agent_fixture,returns,call,check", _ENTRYPOINT_CASES
     )
+    async def test_entrypoint(self, request, sample_email, mock_io,
+                              agent_fixture, returns, call, check):
+        """Run one agent entry point against configured mock returns."""
+        agent = request.getfixturevalue(agent_fixture)
+        for name, value in returns.items():
+            getattr(mock_io, name).return_value = value
+
+        result = await call(agent, sample_email)
+        await flush_pending_writes()
 
+        check(result, sample_email)
 
-@pytest.fixture
-def categorization_agent():
-    """Create categorization agent instance."""
-    return CategorizationAgent()
 
+class TestAgentBatch:
+    """All independent agent scenarios awaited in one gather."""
 
-@pytest.fixture
-def action_item_agent():
-    """Create action item agent instance."""
-    return ActionItemAgent()
+    async def test_all_agents_batch(self, request, mock_io):
+        """Run every mock-and-assert scenario concurrently on one loop."""
+        mock_io.categorize_email.return_value = {
+            "category": "ACTION_REQUIRED",
+            "reason": "Test reason"
+        }
+        mock_io.extract_action_items.return_value = [
+            {"description": "Test task", "priority": "High", "deadline": None}
+        ]
+        mock_io.analyze_email.return_value = {
+            "category": "ACTION_REQUIRED",
+            "reason": "Test reason",
+            "action_items": [
+                {"description": "Test task", "priority": "High", "deadline": None}
+            ],
+            "followups": ["Follow up"]
+        }
+        mock_io.draft_reply.return_value = "This is a test reply."
+        # Shared by the new-draft body and the reply follow-up parse;
+        # only the body is asserted
+        mock_io.generate_text.return_value = "This is a new draft."
+        mock_io.save_email.return_value = "test_001"
+        mock_io.save_draft.return_value = "draft_001"
+        mock_io.complete_action_item.return_value = True
+        mock_io.query_with_sources.return_value = ("Context about emails", [])
+        mock_io.answer_question.return_value = "This is the answer"
 
+        categorization_agent = request.getfixturevalue("categorization_agent")
+        action_item_agent = request.getfixturevalue("action_item_agent")
+        email_analysis_agent = request.getfixturevalue("email_analysis_agent")
+        draft_agent = request.getfixturevalue("draft_agent")
+        rag_agent = request.getfixturevalue("rag_agent")
 
-@pytest.fixture
-def draft_agent():
-    """Create draft agent instance."""
-    return DraftAgent()
+        # Each scenario gets its own email copy — they rebind fields
+        emails = [SAMPLE_EMAIL.model_copy() for _ in range(4)]
 
+        (categorized, extracted, analyzed, reply, new_draft,
+         completed, answer) = await asyncio.gather(
+            categorization_agent.categorize_single_email(emails[0]),
+            action_item_agent.extract_action_items(emails[1]),
+            email_analysis_agent.analyze(emails[2], custom_prompts={}),
+            draft_agent.generate_reply_draft(emails[3]),
+            draft_agent.generate_new_draft(
+                recipient="test@example.com",
+                subject="Test Subject",
+                instructions="Write a professional email"
+            ),
+            action_item_agent.mark_action_item_complete(
+                "test_001", "Test task"
+            ),
+            rag_agent.answer_query("What is the status?")
+        )
+        await flush_pending_writes()
 
-@pytest.fixture
-def rag_agent():
-    """Create RAG agent instance."""
-    return RAGAgent()
+        assert categorized.category == EmailCategory.ACTION_REQUIRED
+        assert categorized.category_reason == "Test reason"
+        assert extracted.action_items[0].description == "Test task"
+        assert analyzed.category == EmailCategory.ACTION_REQUIRED
+        assert len(analyzed.action_items) == 1
+        assert reply.subject.startswith("Re:")
+        assert reply.body == "This is a test reply."
+        assert new_draft.body == "This is a new draft."
+        assert completed is True
+        assert answer["answer"] == "This is the answer"
 
 
 class TestCategorizationAgent:
     """Tests for CategorizationAgent."""
-    
-    @pytest.mark.asyncio
-    async def test_categorize_single_email(self, categorization_agent, sample_email):
-        """Test email categorization."""
-        with patch.object(
-            categorization_agent.llm_service,
-            'categorize_email',
-            new=AsyncMock(return_value={"category": "ACTION_REQUIRED", "reason": "Test reason"})
-        ):
-            with patch.object(
-                categorization_agent.db_service,
-                'save_email',
-                new=AsyncMock(return_value="test_001")
-            ):
-                result = await categorization_agent.categorize_single_email(sample_email)
-                
-                assert result.category == EmailCategory.ACTION_REQUIRED
-                assert result.category_reason == "Test reason"
-    
-    @pytest.mark.asyncio
-    async def test_get_category_statistics(self, categorization_agent):
+
+    async def test_get_category_statistics(self, categorization_agent, mock_io):
         """Test category statistics retrieval."""
-        with patch.object(
-            categorization_agent.db_service,
-            'get_email_count',
-            new=AsyncMock(return_value=5)
-        ):
-            stats = await categorization_agent.get_category_statistics()
-            
-            assert isinstance(stats, dict)
-            assert all(cat.value in stats for cat in EmailCategory)
+        mock_io.category_counts.return_value = {"URGENT": 5, "SPAM": 2}
+
+        stats = await categorization_agent.get_category_statistics()
+
+        assert isinstance(stats, dict)
+        assert all(cat.value in stats for cat in EmailCategory)
+        assert stats["URGENT"] == 5
+        assert stats["INFORMATIONAL"] == 0
 
 
 class TestActionItemAgent:
     """Tests for ActionItemAgent."""
-    
-    @pytest.mark.asyncio
-    async def test_extract_action_items(self, action_item_agent, sample_email):
-        """Test action item extraction."""
-        mock_items = [
-            {"description": "Test task", "priority": "High", "deadline": None}
-        ]
-        
-        with patch.object(
-            action_item_agent.llm_service,
-            'extract_action_items',
-            new=AsyncMock(return_value=mock_items)
-        ):
-            with patch.object(
-                action_item_agent.db_service,
-                'save_email',
-                new=AsyncMock(return_value="test_001")
-            ):
-                result = await action_item_agent.extract_action_items(sample_email)
-                
-                assert len(result.action_items) == 1
-                assert result.action_items[0].description == "Test task"
-                assert result.action_items[0].priority == "High"
-    
-    @pytest.mark.asyncio
-    async def test_mark_action_item_complete(self, action_item_agent, sample_email):
+
+    async def test_mark_action_item_complete(self, action_item_agent, mock_io):
         """Test marking action item as complete."""
-        sample_email.action_items = [
-            ActionItem(description="Test task", priority="High")
-        ]
-        
-        with patch.object(
-            action_item_agent.db_service,
-            'get_email',
-            new=AsyncMock(return_value=sample_email)
-        ):
-            with patch.object(
-                action_item_agent.db_service,
-                'save_email',
-                new=AsyncMock(return_value="test_001")
-            ):
-                result = await action_item_agent.mark_action_item_complete(
-                    "test_001",
-                    "Test task"
-                )
-                
-                assert result is True
-
-
-class TestDraftAgent:
-    """Tests for DraftAgent."""
-    
-    @pytest.mark.asyncio
-    async def test_generate_reply_draft(self, draft_agent, sample_email):
-        """Test reply draft generation."""
-        with patch.object(
-            draft_agent.llm_service,
-            'draft_reply',
-            new=AsyncMock(return_value="This is a test reply.")
-        ):
-            with patch.object(
-                draft_agent,
-                '_generate_followups',
-                new=AsyncMock(return_value=["Follow up 1", "Follow up 2"])
-            ):
-                with patch.object(
-                    draft_agent.db_service,
-                    'save_draft',
-                    new=AsyncMock(return_value="draft_001")
-                ):
-                    result = await draft_agent.generate_reply_draft(sample_email)
-                    
-                    assert isinstance(result, EmailDraft)
-                    assert result.subject.startswith("Re:")
-                    assert result.recipient == sample_email.sender
-                    assert result.body == "This is a test reply."
-    
-    @pytest.mark.asyncio
-    async def test_generate_new_draft(self, draft_agent):
-        """Test new draft generation."""
-        with patch.object(
-            draft_agent.llm_service,
-            'generate_text',
-            new=AsyncMock(return_value="This is a new draft.")
-        ):
-            with patch.object(
-                draft_agent.db_service,
-                'save_draft',
-                new=AsyncMock(return_value="draft_002")
-            ):
-                result = await draft_agent.generate_new_draft(
-                    recipient="test@example.com",
-                    subject="Test Subject",
-                    instructions="Write a professional email"
-                )
-                
-                assert isinstance(result, EmailDraft)
-                assert result.recipient == "test@example.com"
-                assert result.subject == "Test Subject"
+        mock_io.complete_action_item.return_value = True
+
+        result = await action_item_agent.mark_action_item_complete(
+            "test_001",
+            "Test task"
+        )
+
+        assert result is True
+        # The positional update must target exactly the requested
+        # email and action item description
+        mock_io.complete_action_item.assert_awaited_once_with(
+            "test_001", "Test task"
+        )
+
+    async def test_mark_action_item_complete_not_found(self, action_item_agent, mock_io):
+        """Test completion when no matching action item exists."""
+        mock_io.complete_action_item.return_value = False
+
+        result = await action_item_agent.mark_action_item_complete(
+            "test_001",
+            "Missing task"
+        )
+
+        assert result is False
+
+
+class TestEmailAnalysisAgent:
+    """Tests for EmailAnalysisAgent."""
+
+    async def test_analyze(self, email_analysis_agent, sample_email, mock_io):
+        """Test fused email analysis."""
+        mock_io.analyze_email.return_value = {
+            "category": "ACTION_REQUIRED",
+            "reason": "Test reason",
+            "action_items": [
+                {"description": "Test task", "priority": "High", "deadline": None}
+            ],
+            "followups": ["Follow up"]
+        }
+        mock_io.save_email.return_value = "test_001"
+
+        result = await email_analysis_agent.analyze(
+            sample_email,
+            custom_prompts={}
+        )
+
+        assert result.category == EmailCategory.ACTION_REQUIRED
+        assert result.category_reason == "Test reason"
+        assert len(result.action_items) == 1
+        assert result.action_items[0].description == "Test task"
 
 
 class TestRAGAgent:
     """Tests for RAGAgent."""
     
-    @pytest.mark.asyncio
-    async def test_answer_query(self, rag_agent):
+    async def test_answer_query(self, rag_agent, mock_io):
         """Test query answering."""
-        with patch.object(
-            rag_agent.vector_service,
-            'get_relevant_context',
-            new=AsyncMock(return_value="Context about emails")
-        ):
-            with patch.object(
-                rag_agent.llm_service,
-                'answer_question',
-                new=AsyncMock(return_value="This is the answer")
-            ):
-                with patch.object(
-                    rag_agent.vector_service,
-                    'search_similar_emails',
-                    new=AsyncMock(return_value=[])
-                ):
-                    result = await rag_agent.answer_query("What is the status?")
-                    
-                    assert "answer" in result
-                    assert result["answer"] == "This is the answer"
-                    assert "sources" in result
-    
-    @pytest.mark.asyncio
-    async def test_summarize_inbox(self, rag_agent, sample_email):
+        mock_io.query_with_sources.return_value = ("Context about emails", [])
+        mock_io.answer_question.return_value = "This is the answer"
+
+        result = await rag_agent.answer_query("What is the status?")
+
+        assert "answer" in result
+        assert result["answer"] == "This is the answer"
+        assert "sources" in result
+
+    async def test_summarize_inbox(self, rag_agent, sample_email, mock_io):
         """Test inbox summarization."""
-        with patch.object(
-            rag_agent.db_service,
-            'get_all_emails',
-            new=AsyncMock(return_value=[sample_email])
-        ):
-            with patch.object(
-                rag_agent.llm_service,
-                'generate_text',
-                new=AsyncMock(return_value="Inbox summary")
-            ):
-                result = await rag_agent.summarize_inbox()
-                
-                assert result == "Inbox summary"
+        mock_io.get_all_emails.return_value = [sample_email]
+        mock_io.generate_text.return_value = "Inbox summary"
+
+        result = await rag_agent.summarize_inbox()
+
+        assert result == "Inbox summary"
 
 
 if __name__ == "__main__":